@@ -0,0 +1,262 @@
+"""
+Chaos mode: many balls and several paddles per side.
+
+Each side is split in lanes with one IA paddle per lane. Ball vs paddle collisions go through a uniform grid
+broadphase over the map: the paddles are put in the cells they can touch once per frame (they only move once per
+frame), and each ball substep only checks the paddles of its own cell, so the cost per ball stays the same no matter
+how many balls and paddles there are. The IA plans where each ball reaches each side (only again when the ball
+vector changes) and every paddle goes for the first ball coming into its lane.
+
+Run: python arena.py [--balls 1,10,25,50,100] [--paddles 3] [--no-grid]
+"""
+import argparse
+import math
+import random
+import time
+from engine import MAP_LIMITS, SUBSTEP, TIMING, fold, Scoreboard, IA, Ball
+
+
+class Grid:
+    """
+    Uniform grid broadphase of the paddles.
+    """
+    def __init__(self, cell: float = 64):
+        """
+        Init the grid.
+
+        :param cell: (FLOAT) Cell side in pixels.
+        """
+        self.cell = cell
+        self.cells = {} # (column, row): paddles.
+
+    def build(self, paddles: list, margin: float) -> None:
+        """
+        Put each paddle in every cell where a ball center can be touching it.
+
+        :param paddles: (LIST) Paddle instances.
+        :param margin: (FLOAT) Ball half side.
+        :return:
+        """
+        self.cells.clear()
+
+        for paddle in paddles:
+            half_width = paddle.width / 2 + margin
+            half_height = paddle.height / 2 + margin
+            for column in range(math.floor((paddle.pos.x - half_width) / self.cell), math.floor((paddle.pos.x + half_width) / self.cell) + 1):
+                for row in range(math.floor((paddle.pos.y - half_height) / self.cell), math.floor((paddle.pos.y + half_height) / self.cell) + 1):
+                    self.cells.setdefault((column, row), []).append(paddle)
+
+    def near(self, pos: object) -> list:
+        """
+        Paddles that can be touching a ball.
+
+        :param pos: (OBJECT) Vector of the ball center.
+        :return: (LIST) Paddle instances.
+        """
+        return self.cells.get((math.floor(pos.x / self.cell), math.floor(pos.y / self.cell)), ())
+
+
+class LanePaddle(IA):
+    """
+    IA paddle that stays in a lane of its side and plays the ball the arena gives it.
+    """
+    def __init__(self, num_player: int, low: float, high: float):
+        """
+        Init the paddle in the middle of its lane.
+
+        :param num_player: (INT) Side (1 or 2).
+        :param low: (FLOAT) Lane bottom Y cord.
+        :param high: (FLOAT) Lane top Y cord.
+        """
+        super().__init__(num_player=num_player)
+        self.low = low
+        self.high = high
+        self.center = (low + high) / 2
+        self.pos.y = self.center
+        self.last_pos.y = self.center
+
+    def direction(self, ball: object = None) -> str:
+        """
+        Go for the prediction given by Arena.assign(), or back to the lane center.
+
+        :param ball: (OBJECT) Unused, keeps the same signature as IA.direction().
+        :return: (STR) "up", "down" or "hold"
+        """
+        ideal = self.center if self.prediction is None else self.prediction
+        reach = self.height / self.block_length
+
+        if ideal < self.pos.y - reach:
+            return "down"
+        elif ideal > self.pos.y + reach:
+            return "up"
+
+        return "hold"
+
+    def move(self, time: float, direction: str) -> None:
+        """
+        Same as Paddle.move() but inside the lane.
+
+        :param time: (FLOAT) Given time to adjust the speed.
+        :param direction: (STR) "up", "down" or "hold"
+        :return:
+        """
+        distance = round(self.speed * time)
+
+        if direction == "up" and self.pos.y + self.height / 2 < self.high:
+            self.pos.y += distance
+        elif direction == "down" and self.pos.y - self.height / 2 > self.low:
+            self.pos.y -= distance
+
+
+class Arena:
+    """
+    Many balls against several paddles per side.
+    """
+    def __init__(self, balls: int = 10, paddles: int = 3, seed: int = None, grid: bool = True):
+        """
+        Init the entities.
+
+        :param balls: (INT) Number of balls.
+        :param paddles: (INT) Paddles (lanes) per side.
+        :param seed: (INT) Serve random seed.
+        :param grid: (BOOL) Use the grid broadphase, or check every paddle (to compare).
+        """
+        lane = (MAP_LIMITS["y"] - MAP_LIMITS["-y"]) / paddles
+        self.paddles = [
+            LanePaddle(num_player, MAP_LIMITS["-y"] + lane * index, MAP_LIMITS["-y"] + lane * (index + 1))
+            for num_player in (1, 2) for index in range(paddles)
+        ]
+        self.lane = lane
+        self.lanes = paddles
+        self.scores = [Scoreboard(1), Scoreboard(2)]
+
+        serve = random.Random(seed)
+        self.balls = []
+        for index in range(balls):
+            ball = Ball()
+            ball.serve_random = serve
+            ball.relocate(-1 if index % 2 == 0 else 1)
+            ball.planned_vector = None
+            ball.plan_y = ball.plan_time = 0.0
+            self.balls.append(ball)
+
+        self.grid = Grid() if grid else None
+
+    def plan(self, ball: object) -> None:
+        """
+        Where and when the ball reaches the paddles column it goes to, like IA.intercept(). Only solved again when the
+        ball vector changes.
+
+        :param ball: (OBJECT) Ball instance.
+        :return:
+        """
+        vector = ball.vector
+        if ball.planned_vector == (vector.x, vector.y):
+            return
+
+        paddle = self.paddles[0 if vector.x < 0 else -1]
+        face = paddle.pos.x - math.copysign(paddle.width / 2 + ball.diameter / 2, vector.x)
+        ball.plan_time = max((face - ball.pos.x) / vector.x, 0)
+        ball.plan_y = fold(vector.y * ball.plan_time + ball.pos.y)
+        ball.planned_vector = (vector.x, vector.y)
+
+    def assign(self) -> None:
+        """
+        Give each paddle the prediction of the first ball coming into its lane.
+
+        :return:
+        """
+        for paddle in self.paddles:
+            paddle.prediction = None
+            paddle.plan_time = math.inf
+
+        for ball in self.balls:
+            self.plan(ball)
+            lane = min(max(math.floor((ball.plan_y - MAP_LIMITS["-y"]) / self.lane), 0), self.lanes - 1)
+            paddle = self.paddles[lane if ball.vector.x < 0 else self.lanes + lane]
+            if ball.plan_time < paddle.plan_time:
+                paddle.prediction = min(max(ball.plan_y, paddle.low + paddle.height / 2), paddle.high - paddle.height / 2)
+                paddle.plan_time = ball.plan_time
+
+    def move_ball(self, ball: object, paddles: list, time: float) -> None:
+        """
+        Same as Ball.move() against the given paddles, scoring on the arena scoreboards.
+
+        :param ball: (OBJECT) Ball instance.
+        :param paddles: (LIST) Paddles that can be touching it.
+        :param time: (FLOAT) Time to move.
+        :return:
+        """
+        ball.pos.iadd_scaled(ball.vector, time)
+
+        if ball.pos.x < MAP_LIMITS["-x"]:
+            self.scores[1].update()
+            ball.relocate(1)
+        elif ball.pos.x > MAP_LIMITS["x"]:
+            self.scores[0].update()
+            ball.relocate(-1)
+
+        if ball.pos.y > MAP_LIMITS["y"] or ball.pos.y < MAP_LIMITS["-y"]:
+            ball.vector.y *= -1
+
+        for paddle in paddles:
+            if paddle.num_player == 1 and ball.vector.x < 0 and ball.collision(paddle):
+                ball.bounce(ball.pos.y - paddle.pos.y)
+                break
+            elif paddle.num_player == 2 and ball.vector.x > 0 and ball.collision(paddle):
+                ball.bounce(paddle.pos.y - ball.pos.y)
+                break
+
+    def step(self, delta: float) -> None:
+        """
+        Advance the arena one frame: the IA plans, the paddles move, and the balls in fixed SUBSTEP pieces.
+
+        :param delta: (FLOAT) Frame time.
+        :return:
+        """
+        for ball in self.balls:
+            ball.last_pos.assign(ball.pos)
+        for paddle in self.paddles:
+            paddle.last_pos.assign(paddle.pos)
+
+        self.assign()
+        for paddle in self.paddles:
+            paddle.move(time=delta, direction=paddle.direction())
+
+        grid = self.grid
+        if grid is not None:
+            grid.build(self.paddles, margin=self.balls[0].diameter / 2 if self.balls else 0)
+
+        for i in range(math.floor(delta / SUBSTEP)):
+            for ball in self.balls:
+                self.move_ball(ball, grid.near(ball.pos) if grid is not None else self.paddles, SUBSTEP)
+
+
+def main() -> None:
+    """
+    Time a frame for several ball counts.
+
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Many balls and paddles per side.")
+    parser.add_argument("--balls", default="1,10,25,50,100", help="comma separated ball counts")
+    parser.add_argument("--paddles", type=int, default=3, help="paddles per side")
+    parser.add_argument("--frames", type=int, default=500, help="frames timed per ball count")
+    parser.add_argument("--no-grid", action="store_true", help="check every paddle instead of the grid cell ones")
+    args = parser.parse_args()
+
+    delta = TIMING["game_speed"] / TIMING["tick_rate"]
+
+    print(f"{'balls':>6}{'us/frame':>10}{'us/ball':>9}{'score':>10}")
+    for balls in (int(value) for value in args.balls.split(",")):
+        arena = Arena(balls=balls, paddles=args.paddles, seed=0, grid=not args.no_grid)
+        started = time.perf_counter()
+        for frame in range(args.frames):
+            arena.step(delta)
+        elapsed = (time.perf_counter() - started) / args.frames * 1e6
+
+        print(f"{balls:>6}{elapsed:>10.0f}{elapsed / balls:>9.1f}{arena.scores[0].current_score:>5}-{arena.scores[1].current_score:<4}")
+
+
+if __name__ == "__main__":
+    main()
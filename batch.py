@@ -0,0 +1,264 @@
+"""
+Vectorized batch of IA vs IA matches.
+
+Stores N matches as NumPy arrays and advances all of them at once with the same rules as engine.Match.step(), so
+every match in the batch gives exactly the same result as the scalar game. Needs NumPy.
+"""
+import math
+import numpy as np
+from engine import MAP_LIMITS, PLAYER_SPEED, SUBSTEP, Vector, Ball, IA
+
+# Paddle commands. Any negative action lets the IA decide.
+ACTIONS = {
+    "ia": -1,
+    "hold": 0,
+    "up": 1,
+    "down": 2
+}
+
+
+class BatchMatch:
+    """
+    N independent matches advanced together.
+    """
+    def __init__(self, size: int, paddle_speed: object = PLAYER_SPEED["ia"], speed_increment: object = None, max_angle: object = None):
+        """
+        Init the batch arrays. Each config can be a single value or one value per match.
+
+        :param size: (INT) Number of matches.
+        :param paddle_speed: (FLOAT/ARRAY) Paddle speed, shape () (N,) or (N, 2).
+        :param speed_increment: (FLOAT/ARRAY) Ball speed increment on each paddle hit. Ball default if None.
+        :param max_angle: (FLOAT/ARRAY) Max ball angle after a paddle hit. Ball default if None.
+        """
+        ball = Ball()
+        paddle = IA(1)
+
+        self.size = size
+        self.ball_side = ball.diameter / 2
+        self.paddle_x = np.array([MAP_LIMITS["-x"], MAP_LIMITS["x"]])
+        self.paddle_half = (paddle.width / 2, paddle.height / 2)
+        self.paddle_reach = paddle.height / paddle.block_length
+
+        # Config per match.
+        paddle_speed = np.asarray(paddle_speed, dtype=float)
+        if paddle_speed.ndim == 1:
+            paddle_speed = paddle_speed[:, np.newaxis]
+        self.paddle_speed = np.broadcast_to(paddle_speed, (size, 2)).copy()
+        self.speed_increment = np.full(size, ball.speed_increment if speed_increment is None else speed_increment, dtype=float)
+        self.max_angle = np.full(size, ball.max_angle if max_angle is None else max_angle, dtype=float)
+        self.init_speed = np.full(size, ball.init_speed, dtype=float)
+
+        # Serve vectors (before being scaled by the init speed), same as Ball.relocate().
+        self.serve = {direction: Vector(x=direction, y=0.2).normalize() for direction in (-1, 1)}
+        # Optional numpy.random.Generator to serve with a random Y direction, like Ball.serve_random.
+        self.serve_random = None
+
+        # State per match.
+        self.pos = np.zeros((size, 2))
+        self.vector = np.zeros((size, 2))
+        self.speed = np.zeros(size)
+        self.paddle_y = np.zeros((size, 2))
+        self.prediction = np.full((size, 2), np.nan)
+        self.planned = np.full((size, 2, 2), np.nan) # Ball vector of the last plan of each paddle.
+        self.score = np.zeros((size, 2), dtype=np.int64)
+
+        self.reset()
+
+    def reset(self, mask: object = None) -> None:
+        """
+        Put the selected matches back to their init state (ball to the center moving left, paddles centered, scores to 0).
+
+        :param mask: (ARRAY) Boolean mask of the matches to reset. All of them if None.
+        :return:
+        """
+        if mask is None:
+            mask = np.ones(self.size, dtype=bool)
+
+        self.paddle_y[mask] = 0
+        self.prediction[mask] = np.nan
+        self.planned[mask] = np.nan
+        self.score[mask] = 0
+        self.relocate(mask, -1)
+
+    def relocate(self, mask: object, direction: int) -> None:
+        """
+        Same as Ball.relocate() for the selected matches.
+
+        :param mask: (ARRAY) Boolean mask of the matches to relocate.
+        :param direction: (INT) -1 to start moving on left side or 1 to the right side.
+        :return:
+        """
+        self.speed[mask] = self.init_speed[mask]
+        self.pos[mask] = 0
+
+        if self.serve_random is None:
+            serve = self.serve[direction]
+            self.vector[mask, 0] = serve.x * self.init_speed[mask]
+            self.vector[mask, 1] = serve.y * self.init_speed[mask]
+        else:
+            count = np.count_nonzero(mask)
+            y = self.serve_random.choice((-1, 1), size=count) * self.serve_random.uniform(0.1, 0.6, size=count)
+            longitude = np.sqrt(1 + y * y)
+            self.vector[mask, 0] = direction / longitude * self.init_speed[mask]
+            self.vector[mask, 1] = y / longitude * self.init_speed[mask]
+
+    def calculate_bounces(self, player: int, mask: object) -> None:
+        """
+        Vectorized IA.calculate_bounces() (contact Y cord of IA.intercept()) for the selected matches.
+
+        :param player: (INT) Paddle index (0 or 1).
+        :param mask: (ARRAY) Boolean mask of the matches to plan.
+        :return:
+        """
+        if not mask.any():
+            return
+
+        vx = self.vector[mask, 0]
+        vy = self.vector[mask, 1]
+        face = self.paddle_x[player] - np.copysign(self.paddle_half[0] + self.ball_side, vx)
+        time = np.maximum((face - self.pos[mask, 0]) / vx, 0)
+        y = vy * time + self.pos[mask, 1]
+
+        # Same as engine.fold().
+        low = MAP_LIMITS["-y"]
+        span = MAP_LIMITS["y"] - low
+        y = np.mod(y - low, 2 * span)
+        y = low + np.where(y <= span, y, 2 * span - y)
+
+        self.prediction[mask, player] = y
+        self.planned[mask, player] = self.vector[mask]
+
+    def directions(self, player: int) -> object:
+        """
+        Vectorized IA.direction().
+
+        :param player: (INT) Paddle index (0 or 1).
+        :return: (ARRAY) ACTIONS code per match.
+        """
+        away = self.vector[:, 0] > 0 if player == 0 else self.vector[:, 0] < 0
+        self.prediction[away, player] = np.nan
+        self.planned[away, player] = np.nan
+
+        # Plan again only where the ball vector changed (NaN never equals, so there is always a first plan).
+        changed = (self.planned[:, player, 0] != self.vector[:, 0]) | (self.planned[:, player, 1] != self.vector[:, 1])
+        self.calculate_bounces(player=player, mask=~away & changed)
+
+        ideal = np.where(away, 0, self.prediction[:, player])
+        paddle_y = self.paddle_y[:, player]
+
+        down = ideal - self.ball_side < paddle_y - self.paddle_reach
+        up = ~down & (ideal + self.ball_side > paddle_y + self.paddle_reach)
+
+        return np.where(down, ACTIONS["down"], np.where(up, ACTIONS["up"], ACTIONS["hold"]))
+
+    def move_paddles(self, delta: float, actions: object = None) -> None:
+        """
+        Vectorized Paddle.move() for both paddles.
+
+        :param delta: (FLOAT) Frame time.
+        :param actions: (ARRAY) (N, 2) ACTIONS codes. Negative codes (or None) let the IA decide.
+        :return:
+        """
+        for player in range(2):
+            direction = self.directions(player=player)
+            if actions is not None:
+                direction = np.where(actions[:, player] < 0, direction, actions[:, player])
+
+            distance = np.round(self.paddle_speed[:, player] * delta)
+            paddle_y = self.paddle_y[:, player]
+            half = self.paddle_half[1]
+
+            up = (direction == ACTIONS["up"]) & (paddle_y + half < MAP_LIMITS["y"])
+            down = (direction == ACTIONS["down"]) & (paddle_y - half > MAP_LIMITS["-y"])
+
+            paddle_y[up] += distance[up]
+            paddle_y[down] -= distance[down]
+
+    def collision(self, player: int) -> object:
+        """
+        Vectorized Ball.collision().
+
+        :param player: (INT) Paddle index (0 or 1).
+        :return: (ARRAY) Boolean mask of the matches where the ball touches the paddle.
+        """
+        x = self.pos[:, 0]
+        y = self.pos[:, 1]
+        paddle_x = self.paddle_x[player]
+        paddle_y = self.paddle_y[:, player]
+        half_width, half_height = self.paddle_half
+        side = self.ball_side
+
+        return ~((x + side < paddle_x - half_width) | (y + side < paddle_y - half_height) | (x - side > paddle_x + half_width) | (y - side > paddle_y + half_height))
+
+    def bounce(self, index: int, angle: float) -> None:
+        """
+        Paddle hit response of one match, done with the scalar Vector so the result is exactly the same as Ball.move().
+        Hits are rare compared to steps, so it is not worth vectorizing.
+
+        :param index: (INT) Match index.
+        :param angle: (FLOAT) Angle between ball and paddle.
+        :return:
+        """
+        self.speed[index] += self.speed_increment[index]
+        vector = Vector(-self.vector[index, 0], self.vector[index, 1]).normalize().escale(self.speed[index])
+        rotated = vector.rotate(angle)
+
+        if rotated.is_over_angle_limit(self.max_angle[index]):
+            rotated = vector
+
+        self.vector[index] = (rotated.x, rotated.y)
+
+    def move_ball(self, time: float) -> None:
+        """
+        Vectorized Ball.move().
+
+        :param time: (FLOAT) Time to adjust the speed vector (generally SUBSTEP).
+        :return:
+        """
+        self.pos += self.vector * time
+
+        # Goal on each player side.
+        left = self.pos[:, 0] < MAP_LIMITS["-x"]
+        right = self.pos[:, 0] > MAP_LIMITS["x"]
+        if left.any():
+            self.score[left, 1] += 1
+            self.relocate(left, 1)
+        if right.any():
+            self.score[right, 0] += 1
+            self.relocate(right, -1)
+
+        # Map sides
+        walls = (self.pos[:, 1] > MAP_LIMITS["y"]) | (self.pos[:, 1] < MAP_LIMITS["-y"])
+        self.vector[walls, 1] *= -1
+
+        # Ball collision on paddles.
+        hits = [np.flatnonzero((self.vector[:, 0] < 0) & self.collision(0)), np.flatnonzero((self.vector[:, 0] > 0) & self.collision(1))]
+        for index in hits[0]:
+            self.bounce(index, self.pos[index, 1] - self.paddle_y[index, 0])
+        for index in hits[1]:
+            self.bounce(index, self.paddle_y[index, 1] - self.pos[index, 1])
+
+    def step(self, delta: float, actions: object = None) -> None:
+        """
+        Advance all matches one frame, same as engine.Match.step().
+
+        :param delta: (FLOAT) Frame time.
+        :param actions: (ARRAY) Optional (N, 2) ACTIONS codes that override the IA.
+        :return:
+        """
+        self.move_paddles(delta=delta, actions=actions)
+
+        for i in range(math.floor(delta / SUBSTEP)):
+            self.move_ball(time=SUBSTEP)
+
+
+if __name__ == "__main__":
+    import time
+
+    batch = BatchMatch(size=10000)
+    started = time.perf_counter()
+    for frame in range(1000):
+        batch.step(delta=0.05)
+    elapsed = time.perf_counter() - started
+
+    print(f"{batch.size} matches x 1000 frames in {elapsed:.2f}s, {batch.score.sum()} goals")
@@ -0,0 +1,340 @@
+"""
+Benchmarks of the game hot paths.
+
+Everything but the "startup" case runs on the headless engine, so no display is needed.
+
+Run: python benchmark.py [cases] [--save baseline.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from engine import TIMING, SUBSTEP, Vector, Match
+
+# Max slowdown against a baseline before flagging a regression (0.10 = 10% less steps/sec).
+TOLERANCE = 0.10
+
+
+def count_vectors(function: object, repeat: int) -> float:
+    """
+    Count how many Vector objects a function creates on each call.
+
+    :param function: (FUNCTION) Function to call.
+    :param repeat: (INT) Number of calls.
+    :return: (FLOAT) Vectors created per call.
+    """
+    created = 0
+    init = Vector.__init__
+
+    def counting_init(self, x, y):
+        nonlocal created
+        created += 1
+        init(self, x, y)
+
+    Vector.__init__ = counting_init
+    try:
+        for i in range(repeat):
+            function()
+    finally:
+        Vector.__init__ = init
+
+    return created / repeat
+
+
+def vector_ops() -> object:
+    """
+    Vector operations done by the ball on each substep and paddle hit.
+
+    :return: (FUNCTION) One step.
+    """
+    pos = Vector(0, 0)
+    vector = Vector(250, 50)
+
+    def step():
+        pos.iadd_scaled(vector, SUBSTEP)
+        vector.normalize_inplace()
+        vector.escale_inplace(250)
+        vector.rotate_inplace(10)
+        vector.is_over_angle_limit(40)
+
+    return step
+
+
+def ball_move() -> object:
+    """
+    Ball.move() with perfect paddles, so every rally ends with a paddle hit.
+
+    :return: (FUNCTION) One substep.
+    """
+    match = Match()
+    ball = match.ball
+    players = match.players
+
+    def step():
+        ball.move(players=players, time=SUBSTEP)
+        players[0].pos.y = ball.pos.y
+        players[1].pos.y = ball.pos.y
+        if ball.speed > 500:
+            ball.relocate(-1)
+
+    return step
+
+
+def ia_bounces() -> object:
+    """
+    IA.calculate_bounces() with a fast and almost vertical ball (lots of wall bounces before reaching the paddle).
+
+    :return: (FUNCTION) One prediction.
+    """
+    match = Match()
+    ball = match.ball
+    ia = match.players[0]
+    ball.vector = Vector(-1, 8)
+    ball.vector.normalize_inplace()
+    ball.vector.escale_inplace(5000)
+
+    def step():
+        ia.prediction = None
+        ia.calculate_bounces(ball=ball)
+
+    return step
+
+
+def frame(continuous: bool) -> object:
+    """
+    A whole headless frame (IA, paddles and ball), same as one tick of main.startup().
+
+    :param continuous: (BOOL) Use the continuous collision mode.
+    :return: (FUNCTION) One frame.
+    """
+    match = Match(continuous=continuous)
+    delta = TIMING["game_speed"] / TIMING["tick_rate"]
+
+    def step():
+        match.step(delta)
+
+    return step
+
+
+def snapshot() -> object:
+    """
+    Match.snapshot() of a match in play.
+
+    :return: (FUNCTION) One snapshot.
+    """
+    match = Match()
+    for i in range(100):
+        match.step(TIMING["game_speed"] / TIMING["tick_rate"])
+
+    return match.snapshot
+
+
+def restore() -> object:
+    """
+    Match.restore() of a saved state, as done by rollback or by each future of a lookahead search.
+
+    :return: (FUNCTION) One restore.
+    """
+    match = Match()
+    for i in range(100):
+        match.step(TIMING["game_speed"] / TIMING["tick_rate"])
+    state = match.snapshot()
+
+    def step():
+        match.restore(state)
+
+    return step
+
+
+CASES = {
+    "vector": vector_ops,
+    "ball_move": ball_move,
+    "ia_bounces": ia_bounces,
+    "frame": lambda: frame(continuous=False),
+    "frame_continuous": lambda: frame(continuous=True),
+    "snapshot": snapshot,
+    "restore": restore
+}
+
+
+def clock_overhead() -> int:
+    """
+    Cost of reading the clock, taken out of each call timing.
+
+    :return: (INT) Nanoseconds.
+    """
+    clock = time.perf_counter_ns
+
+    return min(-clock() + clock() for i in range(1000))
+
+
+def run(setup: object, repeat: int, number: int) -> dict:
+    """
+    Time a case, each call on its own.
+
+    :param setup: (FUNCTION) Returns the function to time.
+    :param repeat: (INT) Number of rounds.
+    :param number: (INT) Calls per round.
+    :return: (DICT) Steps/sec (from the mean) and ns/step percentiles over the single calls.
+    """
+    function = setup()
+    for i in range(number):
+        function() # Warm up.
+
+    clock = time.perf_counter_ns
+    overhead = clock_overhead()
+    timings = [0] * (repeat * number)
+    for i in range(len(timings)):
+        started = clock()
+        function()
+        timings[i] = clock() - started - overhead
+
+    percentiles = statistics.quantiles(timings, n=100)
+
+    return {
+        "steps_per_sec": 1e9 / statistics.fmean(timings),
+        "p50_ns": statistics.median(timings),
+        "p90_ns": percentiles[89],
+        "p99_ns": percentiles[98],
+        "vectors_per_step": count_vectors(function, number)
+    }
+
+
+# Code run on a new interpreter by bench_startup(), so the imports are cold. Prints the timings as JSON.
+COLD_START = """
+import json, sys, time
+started = time.perf_counter()
+import engine
+engine_time = time.perf_counter() - started
+import classes
+classes_time = time.perf_counter() - started
+result = {"engine_import": engine_time, "classes_import": classes_time, "tkinter_imported": "tkinter" in sys.modules}
+try:
+    import tkinter
+except ImportError:
+    tkinter = None # Python without Tk.
+if tkinter is not None:
+    try:
+        game = classes.Game()
+        players = [classes.IA(1), classes.IA(2)]
+        ball = classes.Ball()
+        game.render(players=players, ball=ball)
+        result["first_frame"] = time.perf_counter() - started
+        result["canvas_items"] = len(game.screen.getcanvas().find_all())
+        result["turtles"] = len(game.screen.turtles())
+        game.screen.bye()
+    except tkinter.TclError:
+        pass # No display.
+print(json.dumps(result))
+"""
+# Cold start budget in seconds: imports plus the screen, the entities and the first frame.
+STARTUP_BUDGET = 0.5
+
+
+def bench_startup(budget: float) -> dict:
+    """
+    Time a cold start on a new interpreter: the headless imports, and the screen startup up to the first frame drawn
+    (Game() plus the entities). The first frame needs Tk and a display, without them it is not measured.
+
+    :param budget: (FLOAT) Max seconds to the first frame.
+    :return: (DICT) Import seconds, and if measured the first frame seconds, canvas items, turtles and "within" budget.
+    """
+    output = subprocess.run([sys.executable, "-c", COLD_START], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True).stdout
+    result = json.loads(output)
+
+    print(f"{'startup':<20}{'engine import':>16}{result['engine_import'] * 1000:>8.1f} ms"
+          f"{'classes import':>16}{result['classes_import'] * 1000:>8.1f} ms (tkinter {'imported' if result['tkinter_imported'] else 'not imported'})")
+    if "first_frame" not in result:
+        print(f"{'':<20}first frame: NOT MEASURED (no display or no Tk), the startup budget is not checked")
+        return result
+
+    result["within"] = result["first_frame"] <= budget
+    print(f"{'':<20}{'first frame':>16}{result['first_frame'] * 1000:>8.1f} ms of {budget * 1000:.0f} ms budget"
+          f"{result['canvas_items']:>8} canvas items{result['turtles']:>4} turtles {'' if result['within'] else 'OVER BUDGET'}")
+
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Print the change of each case against the baseline.
+
+    :param results: (DICT) Actual results.
+    :param baseline: (DICT) Saved results.
+    :param tolerance: (FLOAT) Allowed slowdown.
+    :return: (LIST) Names of the regressed cases.
+    """
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        if name == "startup":
+            # Before/after of the cold start, when both were measured.
+            if "first_frame" in result and "first_frame" in baseline[name]:
+                print(f"{name:<20}{result['first_frame'] / baseline[name]['first_frame'] - 1:>+10.1%} first frame vs baseline "
+                      f"({baseline[name]['first_frame'] * 1000:.1f} -> {result['first_frame'] * 1000:.1f} ms)")
+            continue
+
+        change = result["steps_per_sec"] / baseline[name]["steps_per_sec"] - 1
+        flag = "REGRESSION" if change < -tolerance else ""
+        print(f"{name:<20}{change:>+10.1%} vs baseline {flag}")
+
+        if flag:
+            regressions.append(name)
+
+    return regressions
+
+
+def main() -> int:
+    """
+    Benchmark command line.
+
+    :return: (INT) Exit code, 1 if any case regressed against the baseline or the startup went over its budget.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks of the game hot paths.")
+    parser.add_argument("cases", nargs="*", help=f"cases to run: {', '.join(CASES)}, startup (default: all but startup)")
+    parser.add_argument("--repeat", type=int, default=30, help="rounds per case")
+    parser.add_argument("--number", type=int, default=2000, help="calls per round (each one timed)")
+    parser.add_argument("--save", metavar="FILE", help="save the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown against the baseline")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET, help="max cold start seconds to the first frame")
+    args = parser.parse_args()
+    unknown = [name for name in args.cases if name not in CASES and name != "startup"]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)} (choose from {', '.join(CASES)}, startup)")
+
+    results = {}
+    over_budget = False
+
+    print(f"{'case':<20}{'steps/sec':>12}{'p50 ns':>10}{'p90 ns':>10}{'p99 ns':>10}{'vectors':>9}")
+    for name in args.cases or list(CASES):
+        if name == "startup":
+            results[name] = bench_startup(args.startup_budget)
+            over_budget = not results[name].get("within", True)
+            continue
+
+        result = run(CASES[name], repeat=args.repeat, number=args.number)
+        results[name] = result
+        print(f"{name:<20}{result['steps_per_sec']:>12.0f}{result['p50_ns']:>10.0f}{result['p90_ns']:>10.0f}{result['p99_ns']:>10.0f}{result['vectors_per_step']:>9.2f}")
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=4)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.tolerance):
+            return 1
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
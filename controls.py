@@ -0,0 +1,88 @@
+"""
+Keyboard input of the human players.
+
+Keys are bound only once. Each press and release is queued with its time and the queue is read on every simulation
+tick, so human paddles move smoothly while a key is held instead of only on the OS key repeat.
+"""
+import time
+from collections import deque
+
+# Keys of each human player.
+KEYS = {
+    1: {"up": "w", "down": "s"},
+    2: {"up": "Up", "down": "Down"}
+}
+
+
+class Keyboard:
+    """
+    Queue of key events and the keys held down.
+    """
+    def __init__(self, screen: object):
+        """
+        Init the keyboard.
+
+        :param screen: (OBJECT) Turtle screen receiving the key events.
+        """
+        self.screen = screen
+        self.events = deque() # (time, key, pressed)
+        self.pressed = set()
+
+    def bind(self, players: list) -> None:
+        """
+        Bind the keys of all human players. Only needs to be called once.
+
+        :param players: (LIST) all players instances.
+        :return:
+        """
+        for player in players:
+            if player.is_ia:
+                continue
+
+            for key in KEYS[player.num_player].values():
+                self.screen.onkeypress(lambda key=key: self.events.append((time.perf_counter(), key, True)), key=key)
+                self.screen.onkeyrelease(lambda key=key: self.events.append((time.perf_counter(), key, False)), key=key)
+
+        self.screen.listen()
+
+    def poll(self) -> set:
+        """
+        Process the queued events.
+
+        :return: (SET) Keys held down, plus the ones pressed since the last poll so a quick tap still counts for one tick.
+        """
+        taps = set()
+
+        while self.events:
+            timestamp, key, pressed = self.events.popleft()
+            if pressed:
+                self.pressed.add(key)
+                taps.add(key)
+            else:
+                self.pressed.discard(key)
+
+        return self.pressed | taps
+
+    def apply(self, players: list) -> None:
+        """
+        Set the command of each human player from the keys held. Called once per simulation tick.
+
+        :param players: (LIST) all players instances.
+        :return:
+        """
+        held = self.poll()
+
+        for player in players:
+            if player.is_ia:
+                continue
+
+            keys = KEYS[player.num_player]
+            up = keys["up"] in held
+            down = keys["down"] in held
+
+            if up and not down:
+                player.command = "up"
+            elif down and not up:
+                player.command = "down"
+            else:
+                player.command = "hold"
@@ -0,0 +1,814 @@
+"""
+Headless simulation core of the game.
+
+Holds the game config, the Vector math and the state of the ball, paddles and scoreboards, as well as the Match.step()
+that advances a whole game. Nothing here depends on turtle/tkinter, so it can run without a display.
+"""
+import math
+import struct
+import time
+from collections import namedtuple
+
+'''
+GAME CONFIG CONSTANT VARIABLES.
+'''
+# Map config.
+MAP_DIMENSIONS = {
+    "width": 800,
+    "height": 500
+}
+MAP_DELIMETERS = {
+    "x": 30,
+    "y": 15
+}
+MAP_DIVIDER_LINES = 30
+MAP_LIMITS = {
+    "x": (MAP_DIMENSIONS["width"] / 2) - MAP_DELIMETERS["x"],
+    "y": (MAP_DIMENSIONS["height"] / 2) - MAP_DELIMETERS["y"],
+    "-x": (-MAP_DIMENSIONS["width"] / 2) + abs(MAP_DELIMETERS["x"]),
+    "-y": (-MAP_DIMENSIONS["height"] / 2) + abs(MAP_DELIMETERS["x"])
+}
+# Speed config
+PLAYER_SPEED = {
+    # Human paddles move on every tick while the key is held.
+    "human": MAP_DIMENSIONS["width"] * 0.10,
+    # Easy = 0.03, Medium = 0.31, Hard = 0.32, God = 0.4
+    "ia": MAP_DIMENSIONS["width"] * 0.04
+}
+# Writing
+FONTS ={
+    "scoreboard": ('Courier', 40, 'bold'),
+    "angle_draw": ('Courier', 10, 'normal')
+}
+# Physics config
+SUBSTEP = 0.005 # Fixed time used on each Ball.move() call.
+# Match.snapshot() doubles: ball pos, last pos, vector and speed, then each paddle Y, last Y, score, IA prediction and
+# planned vector (NaN when None).
+BALL_STATE = 7
+PADDLE_STATE = 6
+# Timing config
+TIMING = {
+    "tick_rate": 100, # Simulation updates per second.
+    "render_rate": 60, # Max frames drawn per second.
+    "game_speed": 5 # Game time passed per real second.
+}
+
+
+def divider_blocks() -> list:
+    """
+    Center Y cords of the map divider blocks (20 points high), from the top down. The gaps (10 points) are stretched
+    so the blocks span the whole map height.
+
+    :return: (LIST) Y cords.
+    """
+    height = MAP_LIMITS["y"] * 2
+    blocks = height / (20 + 10)
+    count = math.floor(blocks)
+    # Space left by the last partial block, shared between the gaps.
+    gap = 10 + height * (blocks % 1) / count / count
+
+    # The first block is 10 points (half a block) under the Y limit.
+    return [MAP_LIMITS["y"] - 10 - block * (20 + gap) for block in range(count)]
+
+
+def fold(y: float) -> float:
+    """
+    Fold a Y cord that went over the map limits back into them, as the ball bouncing on the top and bottom walls.
+    The bounces make a triangle wave, so it's a modulo instead of a loop over each bounce.
+
+    :param y: (FLOAT) Y cord without walls.
+    :return: (FLOAT) Y cord inside the map.
+    """
+    low = MAP_LIMITS["-y"]
+    span = MAP_LIMITS["y"] - low
+    y = (y - low) % (2 * span)
+
+    return low + (y if y <= span else 2 * span - y)
+
+
+# Where and when the ball will touch a paddle and the ball vector after it.
+Intercept = namedtuple("Intercept", ("y", "time", "vector"))
+
+
+class Vector:
+    """
+    Used for generating vector speed components on both (X,Y) and positioning cords as well.
+
+    Speed vector: a component that used to determinate ball angle and speed, reducing the actual position the speed vector multiplied by a fixed time. Ex.: y = 50 + (45.77 * 0.05)
+
+    Methods ending in "_inplace" (and .assign() / .iadd_scaled()) change the vector itself instead of returning a new one,
+    so the ball and paddle updates don't create any object on each step.
+    """
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: float, y: float):
+        """
+        Init the speed vector or the position cord.
+
+        :param x: (FLOAT) X cord of the speed vector / position
+        :param y: (FLOAT) Y cord of the speed vector / position
+        """
+        self.x = x
+        self.y = y
+
+    def longitude(self) -> float:
+        """
+        Calculate the actual longitud of the speed vector from its origin.
+
+        :return: (FLOAT) Longitude.
+        """
+        return math.sqrt((self.x * self.x) + (self.y * self.y))
+
+    def escale(self, speed_adjust: float) -> object:
+        """
+        Adjust the speed vector component to an adding/reducing (X,Y) position component.
+        Ex.: ball.pos.y = 50, then speed vector is (11.234 * 0.05) = 0.5617, 50 +/- 0.5617
+
+        :param speed_adjust: (FLOAT) Time to adjust the speed (generally 0.05)
+        :return: (OBJECT) Vector
+        """
+        return Vector((self.x * speed_adjust), (self.y * speed_adjust))
+
+    def sum(self, vector: object) -> object:
+        """
+        Sum actual .escale() speed vector to the (X,Y) positions.
+
+        :param vector: (OBJECT) Actual position on (X,Y).
+        :return: (OBJECT) Vector
+        """
+        return Vector((self.x + vector.x), (self.y + vector.y))
+
+    def normalize(self) -> object:
+        """
+        Adjust vector speed depending on its longitude.
+
+        :return: (OBJECT) Vector
+        """
+        longitude = self.longitude()
+
+        if longitude != 0:
+            vector = self.escale(1 / longitude)
+        else:
+            vector = Vector(x=0, y=0)
+
+        return vector
+
+    def rotate(self, angle: float) -> object:
+        """
+        Generate a new inclination angle when collision with a paddle depending on its actual angle.
+
+        :param angle: (FLOAT) Current angle between ball and paddle.
+        :return: (OBJECT) Vector
+        """
+        radians = math.radians(angle)
+
+        # Calculate the new speed components in (X, Y)
+        x = self.x * math.cos(radians) - self.y * math.sin(radians)
+        y = self.x * math.sin(radians) + self.y * math.cos(radians)
+
+        return Vector(x, y)
+
+    def is_over_angle_limit(self, max_angle: int) -> bool:
+        """
+        Check if actual ball angle is over max angle in order to prevent being too horizontal.
+
+        :param max_angle: (INT) Max angle.
+        :return: (BOOL) True if over max angle / False if not.
+        """
+        current_angle = self.getAngle()
+        current_angle += 360 if current_angle < 0 else 0 # Convert to 360 grades due to math.atan2 only returns degrees in -180 and +180
+
+        # Top cuadrant (max_angle to 90 + max_angle) or bottom cuadrant (270 - max_angle to 270 + max_angle).
+        return (max_angle < current_angle < 90 + max_angle) or (270 - max_angle < current_angle < 270 + max_angle)
+
+    def getAngle(self) -> float:
+        """
+        Get current angle in ANGLE, not radians.
+
+        :return: (FLOAT) Current angle.
+        """
+        return math.atan2(self.y, self.x) * 180 / math.pi
+
+    def getRelativeAngle(self) -> float:
+        """
+        Get the relative angle to the paddle.
+
+        :return: (FLOAT) Current relative angle.
+        """
+        angle = self.getAngle()
+
+        if angle >= 180: angle -= 180
+        if angle > 90: angle = 180 - angle
+        if angle <= -180: angle += 180
+        if angle < -90: angle = -180 - angle
+
+        return angle
+
+    def clone(self) -> object:
+        """
+        Clone the actual speed vector config.
+
+        :return: (OBJECT) Vector
+        """
+        return Vector(self.x, self.y)
+
+    def lerp(self, vector: object, alpha: float) -> object:
+        """
+        Interpolate between this position and another one.
+
+        :param vector: (OBJECT) Position to go to.
+        :param alpha: (FLOAT) 0 gives this position, 1 gives the other one.
+        :return: (OBJECT) Vector
+        """
+        return Vector(self.x + (vector.x - self.x) * alpha, self.y + (vector.y - self.y) * alpha)
+
+    def assign(self, vector: object) -> None:
+        """
+        Copy another vector cords into this one.
+
+        :param vector: (OBJECT) Vector to copy.
+        :return:
+        """
+        self.x = vector.x
+        self.y = vector.y
+
+    def iadd_scaled(self, vector: object, speed_adjust: float) -> None:
+        """
+        In place .sum(vector.escale(speed_adjust)). Ex.: ball.pos.iadd_scaled(ball.vector, 0.005)
+
+        :param vector: (OBJECT) Speed vector.
+        :param speed_adjust: (FLOAT) Time to adjust the speed.
+        :return:
+        """
+        self.x = self.x + (vector.x * speed_adjust)
+        self.y = self.y + (vector.y * speed_adjust)
+
+    def escale_inplace(self, speed_adjust: float) -> None:
+        """
+        In place .escale().
+
+        :param speed_adjust: (FLOAT) Factor to adjust the vector.
+        :return:
+        """
+        self.x = self.x * speed_adjust
+        self.y = self.y * speed_adjust
+
+    def normalize_inplace(self) -> None:
+        """
+        In place .normalize().
+
+        :return:
+        """
+        longitude = self.longitude()
+
+        if longitude != 0:
+            self.escale_inplace(1 / longitude)
+        else:
+            self.x = 0
+            self.y = 0
+
+    def rotate_inplace(self, angle: float) -> None:
+        """
+        In place .rotate().
+
+        :param angle: (FLOAT) Current angle between ball and paddle.
+        :return:
+        """
+        radians = math.radians(angle)
+        cos = math.cos(radians)
+        sin = math.sin(radians)
+
+        self.x, self.y = self.x * cos - self.y * sin, self.x * sin + self.y * cos
+
+
+class Scoreboard:
+    """
+    Hits record of all involved players (1 and 2).
+    """
+    def __init__(self, player: int):
+        """
+        Init the player scoreboard.
+
+        :param player: (INT) Number of player (1 or 2).
+        """
+        self.num_player = player
+        self.current_score = 0
+
+    def update(self) -> None:
+        """
+        Update the player score if hit a goal.
+
+        :return:
+        """
+        self.current_score += 1
+
+
+class Paddle:
+    """
+    Paddle main config.
+    """
+    # Scoreboard class used by Player and IA. The turtle views replace it with a drawable one.
+    scoreboard = Scoreboard
+
+    def __init__(self, num_player: int):
+        """
+        Init the paddle.
+
+        :param num_player: (INT) Number of player (1 or 2).
+        """
+        self.block_length = 3
+        self.diameter = 20
+        self.num_player = num_player
+        self.width = self.diameter
+        self.height = self.diameter * self.block_length
+
+        # Center of the paddle (middle block) on the left or right side of the screen.
+        self.pos = Vector((MAP_LIMITS["-x"] if self.num_player == 1 else MAP_LIMITS["x"]), 0)
+        # Position before the last Match.step(), used to interpolate the drawing between steps.
+        self.last_pos = self.pos.clone()
+
+    def __map_collission(self, direction: str) -> bool:
+        """
+        Check if paddle is in collission with the top and bottom screen.
+
+        :param direction: (STR) "up" or "down"
+        :return: (BOOL) True if in collision / False if not.
+        """
+        half = self.height / 2
+
+        if direction == "up":
+            if (self.pos.y + half) < MAP_LIMITS["y"]:
+                return False
+        elif direction == "down":
+            if (self.pos.y - half) > MAP_LIMITS["-y"]:
+                return False
+
+        return True
+
+    def move(self, time: float, direction: str) -> None:
+        """
+        Moving the paddles.
+
+        :param time: (FLOAT) Given time to adjust the speed (generally 0.05)
+        :param direction: (STR) "up", "down" or "hold"
+        :return:
+        """
+        # y = y * Vy * t
+        distance = round(self.speed * time)
+
+        if not self.__map_collission(direction=direction):
+            if direction == "up":
+                self.pos.y = (self.pos.y + distance)
+            elif direction == "down":
+                self.pos.y = (self.pos.y - distance)
+
+
+class Player(Paddle):
+    """
+    Human controlled paddle.
+    """
+    def __init__(self, num_player):
+        """
+        Init the paddle as well as the human paddle config.
+
+        :param num_player: (INT) Number of player (1 or 2)
+        """
+        super().__init__(num_player=num_player)
+        self.is_ia = False
+        self.score = self.scoreboard(player=num_player)
+        self.speed = PLAYER_SPEED["human"]
+        self.command = "hold"
+
+    def direction(self, ball: object) -> str:
+        """
+        Direction requested by the human controlling the paddle.
+
+        :param ball: (OBJECT) Actual ball instance (unused, keeps the same signature as IA.direction()).
+        :return: (STR) "up", "down" or "hold"
+        """
+        return self.command
+
+
+class IA(Paddle):
+    """
+    Computer controlled paddle.
+    """
+    def __init__(self, num_player):
+        """
+        Init the paddle as well as the computer paddle config.
+
+        :param num_player: (INT) Number of player (1 or 2)
+        """
+        super().__init__(num_player=num_player)
+        self.is_ia = True
+        self.score = self.scoreboard(player=num_player)
+        self.speed = PLAYER_SPEED["ia"]
+        self.prediction = None
+        self.planned_vector = None # Ball vector when the plan was made.
+
+    def intercept(self, ball: object, paddle_y: float = None) -> Intercept:
+        """
+        Solve where and when the ball reaches the paddle, and how it comes back, in constant time no matter how many
+        wall bounces there are on the way.
+
+        :param ball: (OBJECT) Actual ball instance (with all its attributes).
+        :param paddle_y: (FLOAT) Y cord of the paddle on the contact. Centered on the contact if None.
+        :return: (OBJECT) Intercept with the contact Y cord, the time to reach it and the vector after the paddle hit.
+        """
+        time = self.reach_time(ball=ball)
+
+        # Y cord without walls, then folded back into the map. An odd number of wall bounces flips the Y direction.
+        y = ball.vector.y * time + ball.pos.y
+        contact = fold(y)
+        bounces = math.floor((y - MAP_LIMITS["-y"]) / (MAP_LIMITS["y"] - MAP_LIMITS["-y"]))
+
+        # Same response as Ball.bounce().
+        vector = Vector(-ball.vector.x, ball.vector.y if bounces % 2 == 0 else -ball.vector.y)
+        vector.normalize_inplace()
+        vector.escale_inplace(ball.speed + ball.speed_increment)
+        x, y = vector.x, vector.y
+
+        paddle_y = contact if paddle_y is None else paddle_y
+        vector.rotate_inplace((contact - paddle_y) if self.num_player == 1 else (paddle_y - contact))
+        if vector.is_over_angle_limit(ball.max_angle):
+            vector.x, vector.y = x, y
+
+        return Intercept(contact, time, vector)
+
+    def reach_time(self, ball: object) -> float:
+        """
+        Time until the ball touches the paddle face.
+
+        :param ball: (OBJECT) Actual ball instance (with all its attributes).
+        :return: (FLOAT) Time (0 if it's already there).
+        """
+        face = self.pos.x - math.copysign(self.width / 2 + ball.diameter / 2, ball.vector.x)
+
+        return max((face - ball.pos.x) / ball.vector.x, 0)
+
+    def calculate_bounces(self, ball: object) -> None:
+        """
+        Calculate the bounces of the ball in order to position whe computer controlled paddle in the correct direction.
+        Only the contact Y cord of .intercept() is needed, so it's solved without building the vector after the hit.
+
+        :param ball: (OBJECT) Actual ball instance (with all its attributes).
+        :return:
+        """
+        self.prediction = fold(ball.vector.y * self.reach_time(ball=ball) + ball.pos.y)
+        self.planned_vector = (ball.vector.x, ball.vector.y)
+
+    def direction(self, ball: object) -> str:
+        """
+        Control when to start moving the paddle and when to go to the center position.
+        The contact is only planned again when the ball vector changes.
+
+        :param ball: (OBJECT) Actual ball instance (with all its attributes).
+        :return: (STR) "up", "down" or "hold"
+        """
+        ideal = None
+
+        if (self.num_player == 1 and ball.vector.x > 0) or (self.num_player == 2 and ball.vector.x < 0):
+            ideal = 0 # Center of the screen (MAP_LIMITS["x" or "-x"], 0)
+            self.prediction = None
+            self.planned_vector = None
+        else:
+            if self.planned_vector != (ball.vector.x, ball.vector.y):
+                self.calculate_bounces(ball=ball)
+            ideal = self.prediction
+
+        ball_side = ball.diameter / 2
+        if ideal - ball_side < self.pos.y - self.height / self.block_length:
+            return "down"
+        elif ideal + ball_side > self.pos.y + self.height / self.block_length:
+            return "up"
+
+        return "hold"
+
+
+class Ball:
+    """
+    Ball state and movement.
+    """
+    def __init__(self):
+        """
+        Init the ball and all its variables, as well as place to its init pos.
+        """
+        # Speed
+        self.init_speed = MAP_DIMENSIONS["height"] * 0.1
+        self.speed = self.init_speed
+        self.speed_increment = 5
+
+        # Vector speed movement
+        self.vector = Vector(x=0, y=0)
+
+        # Ball position (and the one before the last Match.step(), used to interpolate the drawing)
+        self.init_pos = Vector(x=0, y=0)
+        self.pos = Vector(x=0, y=0)
+        self.last_pos = Vector(x=0, y=0)
+
+        # Angle movement
+        self.max_angle = 40
+
+        # Ball size
+        self.diameter = 20
+
+        # Optional random.Random to serve with a random Y direction instead of always the same one.
+        self.serve_random = None
+
+        # Optional list/deque receiving the ball events (see .emit()), ex.: telemetry.EventWriter.events.
+        self.events = None
+
+        # Put ball into center and set X vector to -1.
+        self.relocate(-1)
+
+    def increment_speed(self) -> None:
+        """
+        Increment the speed vector when collission with a paddle.
+
+        :return:
+        """
+        self.speed += self.speed_increment
+        self.vector.normalize_inplace()
+        self.vector.escale_inplace(self.speed)
+
+    def relocate(self, direction: int) -> None:
+        """
+        Re-position the ball to the center of the screen.
+        Depending on the actual vector direction config, the ball will start moving to the left or right side.
+
+        :param direction: (INT) -1 to start moving on left side or 1 to the right side.
+        :return:
+        """
+        if self.events is not None:
+            self.emit("relocate", direction)
+
+        self.speed = self.init_speed
+        self.pos.assign(self.init_pos)
+        self.last_pos.assign(self.pos) # Don't interpolate the jump to the center.
+        # Set a no-zero value in Y in order to not gettin' a 0 grade angle.
+        self.vector.x = direction
+        self.vector.y = 0.2 if self.serve_random is None else self.serve_random.choice((-1, 1)) * self.serve_random.uniform(0.1, 0.6)
+        self.vector.normalize_inplace()
+        self.vector.escale_inplace(self.init_speed)
+
+    def move(self, players: list, time: float) -> None:
+        """
+        Start moving the ball.
+        Adding or reducing the actual speed vector components on (X,Y) to the actual (X,Y) ball position.
+
+        :param players: (LIST) all players instances with all its attributes.
+        :param time: (FLOAT) Actual time to adjust the speed vector (generally 0.05).
+        :return:
+        """
+        # Sum the speed vector adjustment to the actual (X,Y) POSITION.
+        self.pos.iadd_scaled(self.vector, time)
+
+        # Goal on each player side.
+        if self.pos.x < MAP_LIMITS["-x"]:
+            if self.events is not None:
+                self.emit("goal", 2)
+            players[1].score.update()
+            self.relocate(1)
+        elif self.pos.x > MAP_LIMITS["x"]:
+            if self.events is not None:
+                self.emit("goal", 1)
+            players[0].score.update()
+            self.relocate(-1)
+
+        # Map sides
+        if self.pos.y > MAP_LIMITS["y"]:
+            self.vector.y *= -1
+            if self.events is not None:
+                self.emit("wall")
+            self.draw_angle()
+        elif self.pos.y < MAP_LIMITS["-y"]:
+            self.vector.y *= -1
+            if self.events is not None:
+                self.emit("wall")
+            self.draw_angle()
+
+        # Ball collision on paddle.
+        if self.vector.x < 0 and self.collision(players[0]):
+            self.bounce(self.pos.y - players[0].pos.y)
+        elif self.vector.x > 0 and self.collision(players[1]):
+            self.bounce(players[1].pos.y - self.pos.y)
+
+    def bounce(self, angle: float) -> None:
+        """
+        Send the ball back after hitting a paddle, speeding it up and rotating it depending on where it hit.
+
+        :param angle: (FLOAT) Current angle between ball and paddle.
+        :return:
+        """
+        self.vector.x *= -1
+        self.increment_speed()
+        x, y = self.vector.x, self.vector.y # Keep the vector. Used in case .rotate_inplace() gives a high horizontal angle.
+        self.vector.rotate_inplace(angle)
+
+        # Checking current angle in order to prevent ball being too vertical.
+        # Fix the angle if neccesary in order to maintain the diagonal movement.
+        if self.vector.is_over_angle_limit(self.max_angle):
+            self.vector.x, self.vector.y = x, y
+
+        if self.events is not None:
+            self.emit("hit", angle)
+        self.draw_angle()
+
+    def sweep(self, players: list, time: float) -> int:
+        """
+        Continuous version of .move(): instead of fixed steps, solve when the ball touches the next wall, paddle or goal
+        and jump straight to it. Uses the whole given time and the ball can't go through a paddle at any speed.
+
+        :param players: (LIST) all players instances with all its attributes.
+        :param time: (FLOAT) Time to move the ball.
+        :return: (INT) Number of moves done (contacts + 1).
+        """
+        ball_side = self.diameter / 2
+        moves = 0
+
+        while time > 0:
+            moves += 1
+            contact = time
+            event = None
+
+            # Map sides
+            if self.vector.y > 0:
+                wall = (MAP_LIMITS["y"] - self.pos.y) / self.vector.y
+            elif self.vector.y < 0:
+                wall = (MAP_LIMITS["-y"] - self.pos.y) / self.vector.y
+            else:
+                wall = time
+            if wall < contact:
+                contact, event = max(wall, 0), "wall"
+
+            # Paddle in front of the ball. Already overlapping counts as touching it now.
+            index = 0 if self.vector.x < 0 else 1
+            paddle = players[index]
+            face = paddle.pos.x - math.copysign(paddle.width / 2 + ball_side, self.vector.x)
+            hit = (face - self.pos.x) / self.vector.x
+            if hit < 0 and self.collision(paddle):
+                hit = 0
+            if 0 <= hit < contact and abs(self.pos.y + self.vector.y * hit - paddle.pos.y) <= paddle.height / 2 + ball_side:
+                contact, event = hit, "paddle"
+
+            # Goal on the paddle side.
+            goal = ((MAP_LIMITS["-x"] if index == 0 else MAP_LIMITS["x"]) - self.pos.x) / self.vector.x
+            if goal < contact:
+                contact, event = max(goal, 0), "goal"
+
+            self.pos.iadd_scaled(self.vector, contact)
+            time -= contact
+
+            if event == "wall":
+                self.vector.y *= -1
+                if self.events is not None:
+                    self.emit("wall")
+                self.draw_angle()
+            elif event == "paddle":
+                self.bounce((self.pos.y - paddle.pos.y) if index == 0 else (paddle.pos.y - self.pos.y))
+            elif event == "goal":
+                if self.events is not None:
+                    self.emit("goal", 2 - index)
+                players[1 - index].score.update()
+                self.relocate(-1 if index == 1 else 1)
+
+        return moves
+
+    def collision(self, paddle: object) -> bool:
+        """
+        Detect ball collission on the paddles.
+
+        :param paddle: (OBJECT) Paddle instance with all its attributes.
+        :return: (BOOL) True if in collission / False if not.
+        """
+        ball_side = (self.diameter / 2)
+
+        if self.pos.x + ball_side < paddle.pos.x - (paddle.width / 2): return False
+        if self.pos.y + ball_side < paddle.pos.y - (paddle.height / 2): return False
+        if self.pos.x - ball_side > paddle.pos.x + (paddle.width / 2): return False
+        if self.pos.y - ball_side > paddle.pos.y + (paddle.height / 2): return False
+
+        return True
+
+    def emit(self, event: str, value: float = 0) -> None:
+        """
+        Append an event with the ball state to .events. Only called when .events is set, so the physics only pays a
+        "events is None" check on walls, hits, goals and relocations.
+
+        :param event: (STR) "hit" (value = angle between ball and paddle), "wall", "goal" (value = player that scored)
+        or "relocate" (value = serve direction).
+        :param value: (FLOAT) Event value.
+        :return:
+        """
+        self.events.append((event, time.time(), self.pos.x, self.pos.y, self.vector.x, self.vector.y, self.speed, value))
+
+    def draw_angle(self) -> None:
+        """
+        Called each time the ball bounces on a wall or paddle. Nothing to draw when headless.
+
+        :return:
+        """
+
+
+class Match:
+    """
+    A whole game (players + ball) that can be advanced without any screen.
+    """
+    def __init__(self, players: list = None, ball: object = None, continuous: bool = False):
+        """
+        Init the match entities.
+
+        :param players: (LIST) Player 1 and 2 instances (Player or IA). Two IA by default.
+        :param ball: (OBJECT) Ball instance. A new one by default.
+        :param continuous: (BOOL) Move the ball with Ball.sweep() instead of fixed SUBSTEP Ball.move() calls.
+        """
+        self.players = players if players is not None else [IA(1), IA(2)]
+        self.ball = ball if ball is not None else Ball()
+        self.continuous = continuous
+        # Direction each paddle moved on the last step.
+        self.directions = ["hold"] * len(self.players)
+        # Optional profiler.FrameProfiler timing the IA and physics phases.
+        self.profiler = None
+        # Optional replay.Recorder saving each step.
+        self.recorder = None
+        # Layout of .snapshot().
+        self.state = struct.Struct(f"<{BALL_STATE + PADDLE_STATE * len(self.players)}d")
+
+    def step(self, delta: float) -> None:
+        """
+        Advance the match one frame: move the paddles and then the ball, in fixed SUBSTEP pieces or continuously.
+
+        :param delta: (FLOAT) Frame time.
+        :return:
+        """
+        self.ball.last_pos.assign(self.ball.pos)
+        for player in self.players:
+            player.last_pos.assign(player.pos)
+
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin()
+
+        for index, player in enumerate(self.players):
+            direction = player.direction(ball=self.ball)
+            self.directions[index] = direction
+            player.move(time=delta, direction=direction)
+
+        if profiler is not None:
+            profiler.lap("ia")
+
+        if self.continuous:
+            substeps = self.ball.sweep(players=self.players, time=delta)
+        else:
+            substeps = math.floor(delta / SUBSTEP)
+            for i in range(substeps):
+                self.ball.move(players=self.players, time=SUBSTEP)
+
+        if profiler is not None:
+            profiler.lap("physics", substeps=substeps)
+
+        if self.recorder is not None:
+            self.recorder.record(delta)
+
+    def snapshot(self) -> bytes:
+        """
+        Pack the whole simulated state into an immutable array of doubles, to go back to it later with .restore().
+        The ball serve_random generator state is not included.
+
+        :return: (BYTES) State (see BALL_STATE and PADDLE_STATE).
+        """
+        ball = self.ball
+        values = [ball.pos.x, ball.pos.y, ball.last_pos.x, ball.last_pos.y, ball.vector.x, ball.vector.y, ball.speed]
+
+        for player in self.players:
+            if player.is_ia:
+                planned = player.planned_vector or (math.nan, math.nan)
+                values += (player.pos.y, player.last_pos.y, player.score.current_score,
+                           math.nan if player.prediction is None else player.prediction, planned[0], planned[1])
+            else:
+                values += (player.pos.y, player.last_pos.y, player.score.current_score, math.nan, math.nan, math.nan)
+
+        return self.state.pack(*values)
+
+    def restore(self, state: bytes) -> None:
+        """
+        Go back to a state saved by .snapshot().
+
+        :param state: (BYTES) State.
+        :return:
+        """
+        values = self.state.unpack(state)
+
+        ball = self.ball
+        ball.pos.x, ball.pos.y, ball.last_pos.x, ball.last_pos.y, ball.vector.x, ball.vector.y, ball.speed = values[:BALL_STATE]
+
+        offset = BALL_STATE
+        for player in self.players:
+            player.pos.y, player.last_pos.y, score, prediction, planned_x, planned_y = values[offset:offset + PADDLE_STATE]
+            player.score.current_score = int(score)
+            offset += PADDLE_STATE
+
+            if player.is_ia:
+                # Only the prediction and its vector drive IA.direction().
+                player.prediction = None if math.isnan(prediction) else prediction
+                player.planned_vector = None if math.isnan(planned_x) else (planned_x, planned_y)
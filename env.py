@@ -0,0 +1,151 @@
+"""
+Gym-style vectorized environment of the game, for training paddle policies.
+
+Runs N matches on a batch.BatchMatch (same paddle and ball rules as the game) and takes one action per paddle and
+match on each step: "hold", "up", "down" (ACTIONS codes 0, 1, 2) or -1 to let the IA play that paddle. Each match is
+an episode that ends on a goal (or after a number of goals), or is cut after max_steps, and is reset on its own
+right away. Needs NumPy.
+
+Run: python env.py [--envs 1024] [--steps 500]
+"""
+import argparse
+import time
+import numpy as np
+from engine import MAP_LIMITS, TIMING
+from batch import ACTIONS, BatchMatch
+
+# Observation columns, all scaled to about -1 to 1.
+OBSERVATION = ("ball_x", "ball_y", "vector_x", "vector_y", "paddle_1_y", "paddle_2_y")
+
+
+class VectorEnv:
+    """
+    N matches with a step/reset interface.
+    """
+    def __init__(self, num_envs: int, seed: int = None, goals: int = 1, max_steps: int = 2000, delta: float = TIMING["game_speed"] / TIMING["tick_rate"], **config):
+        """
+        Init the matches.
+
+        :param num_envs: (INT) Number of matches.
+        :param seed: (INT) Seed of the serves.
+        :param goals: (INT) Goals (of any player) that end an episode.
+        :param max_steps: (INT) Steps before an episode is cut (truncated).
+        :param delta: (FLOAT) Game time of a step.
+        :param config: BatchMatch config (paddle_speed, speed_increment, max_angle).
+        """
+        self.num_envs = num_envs
+        self.goals = goals
+        self.max_steps = max_steps
+        self.delta = delta
+        self.batch = BatchMatch(size=num_envs, **config)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.seed(seed)
+
+    def seed(self, seed: int = None) -> None:
+        """
+        Seed the serves, so the same seed and actions give the same episodes.
+
+        :param seed: (INT) Seed, random if None.
+        :return:
+        """
+        self.batch.serve_random = np.random.default_rng(seed)
+
+    def observe(self) -> object:
+        """
+        Observation of every match.
+
+        :return: (ARRAY) (N, len(OBSERVATION)) float32.
+        """
+        batch = self.batch
+        observation = np.empty((self.num_envs, len(OBSERVATION)), dtype=np.float32)
+        observation[:, 0] = batch.pos[:, 0] / MAP_LIMITS["x"]
+        observation[:, 1] = batch.pos[:, 1] / MAP_LIMITS["y"]
+        observation[:, 2:4] = batch.vector / batch.speed[:, np.newaxis]
+        observation[:, 4:6] = batch.paddle_y / MAP_LIMITS["y"]
+
+        return observation
+
+    def reset(self, seed: int = None) -> object:
+        """
+        Start a new episode on every match.
+
+        :param seed: (INT) Seed the serves again if given.
+        :return: (ARRAY) Observations.
+        """
+        if seed is not None:
+            self.seed(seed)
+
+        self.batch.reset()
+        self.steps[:] = 0
+
+        return self.observe()
+
+    def step(self, actions: object) -> tuple:
+        """
+        Advance every match one step, resetting the ones that ended.
+
+        :param actions: (ARRAY) (N, 2) codes per paddle, or (N,) for paddle 1 with the IA on paddle 2. Codes are the
+        ACTIONS values (-1 = IA) or their names.
+        :return: (TUPLE) observations (N, 6), rewards (N, 2) (+1 scoring, -1 conceding), dones (N,) and an info dict
+        with "truncated" (N,) and "final_observation" of the ended matches (observations are already from the new
+        episode there).
+        """
+        actions = np.asarray(actions)
+        if actions.dtype.kind in "US":
+            actions = np.vectorize(ACTIONS.__getitem__, otypes=[np.int64])(actions)
+        if actions.ndim == 1:
+            actions = np.stack((actions, np.full(self.num_envs, ACTIONS["ia"])), axis=1)
+
+        batch = self.batch
+        score = batch.score.copy()
+        batch.step(delta=self.delta, actions=actions)
+        self.steps += 1
+
+        goals = batch.score - score
+        rewards = (goals - goals[:, ::-1]).astype(np.float32)
+        terminated = batch.score.sum(axis=1) >= self.goals
+        truncated = ~terminated & (self.steps >= self.max_steps)
+        dones = terminated | truncated
+
+        observation = self.observe()
+        info = {"truncated": truncated}
+        if dones.any():
+            info["final_observation"] = observation[dones].copy()
+            batch.reset(dones)
+            self.steps[dones] = 0
+            observation[dones] = self.observe()[dones]
+
+        return observation, rewards, dones, info
+
+
+def main() -> None:
+    """
+    Time random paddle 1 actions against the IA.
+
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Vectorized environment throughput.")
+    parser.add_argument("--envs", type=int, default=1024, help="parallel matches")
+    parser.add_argument("--steps", type=int, default=500, help="steps of every match")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    env = VectorEnv(num_envs=args.envs, seed=args.seed)
+    env.reset()
+    random = np.random.default_rng(args.seed)
+    actions = random.integers(0, 3, size=(args.steps, args.envs))
+
+    rewards = np.zeros(2)
+    episodes = 0
+    started = time.perf_counter()
+    for step in range(args.steps):
+        observation, reward, dones, info = env.step(actions[step])
+        rewards += reward.sum(axis=0)
+        episodes += np.count_nonzero(dones)
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.envs * args.steps / elapsed:.0f} env-steps/s, {episodes} episodes, rewards random {rewards[0]:.0f} IA {rewards[1]:.0f}")
+
+
+if __name__ == "__main__":
+    main()
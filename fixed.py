@@ -0,0 +1,368 @@
+"""
+Deterministic fixed-point physics mode.
+
+Same game as engine.Match in substep mode but every position, vector and speed is an integer in 16.16 fixed point
+(1 pixel = 65536), speeds are stored per SUBSTEP, the paddle deflection uses precomputed sine/cosine tables and
+lengths use math.isqrt. There is no float math on the simulation, so the same inputs give bit-identical
+trajectories on every machine (use FixedMatch.digest() to compare runs).
+
+Run: python fixed.py [--frames 100000]
+"""
+import argparse
+import hashlib
+import math
+import struct
+import time
+from engine import MAP_LIMITS, PLAYER_SPEED, SUBSTEP, Ball, Paddle, Match
+
+SHIFT = 16
+ONE = 1 << SHIFT
+HALF = ONE >> 1
+SUBSTEPS_PER_SECOND = round(1 / SUBSTEP)
+LIMITS = {key: round(value * ONE) for key, value in MAP_LIMITS.items()}
+# round(sin(degrees) * ONE) for 0 to 90 degrees.
+SIN = (
+    0, 1144, 2287, 3430, 4572, 5712, 6850, 7987, 9121, 10252, 11380, 12505, 13626, 14742, 15855, 16962, 18064, 19161,
+    20252, 21336, 22415, 23486, 24550, 25607, 26656, 27697, 28729, 29753, 30767, 31772, 32768, 33754, 34729, 35693,
+    36647, 37590, 38521, 39441, 40348, 41243, 42126, 42995, 43852, 44695, 45525, 46341, 47143, 47930, 48703, 49461,
+    50203, 50931, 51643, 52339, 53020, 53684, 54332, 54963, 55578, 56175, 56756, 57319, 57865, 58393, 58903, 59396,
+    59870, 60326, 60764, 61183, 61584, 61966, 62328, 62672, 62997, 63303, 63589, 63856, 64104, 64332, 64540, 64729,
+    64898, 65048, 65177, 65287, 65376, 65446, 65496, 65526, 65536
+)
+
+
+def div(a: int, b: int) -> int:
+    """
+    Integer division rounding toward zero, so positive and negative values are treated the same.
+
+    :param a: (INT) Dividend.
+    :param b: (INT) Divisor.
+    :return: (INT) Quotient.
+    """
+    quotient = abs(a) // abs(b)
+
+    return quotient if (a < 0) == (b < 0) else -quotient
+
+
+def sin(degrees: int) -> int:
+    """
+    Sine of an integer angle from the table.
+
+    :param degrees: (INT) Angle.
+    :return: (INT) Sine in fixed point.
+    """
+    degrees %= 360
+
+    if degrees <= 90:
+        return SIN[degrees]
+    elif degrees <= 180:
+        return SIN[180 - degrees]
+    elif degrees <= 270:
+        return -SIN[degrees - 180]
+
+    return -SIN[360 - degrees]
+
+
+def cos(degrees: int) -> int:
+    """
+    Cosine of an integer angle from the table.
+
+    :param degrees: (INT) Angle.
+    :return: (INT) Cosine in fixed point.
+    """
+    return sin(degrees + 90)
+
+
+def scale_to(x: int, y: int, length: int) -> tuple:
+    """
+    Same as Vector.normalize().escale(length).
+
+    :param x: (INT) X component.
+    :param y: (INT) Y component.
+    :param length: (INT) New length.
+    :return: (TUPLE) (x, y)
+    """
+    longitude = math.isqrt(x * x + y * y)
+    if longitude == 0:
+        return 0, 0
+
+    return div(x * length, longitude), div(y * length, longitude)
+
+
+def is_between(x: int, y: int, start: int, end: int) -> bool:
+    """
+    Check if a vector angle is strictly between two angles less than 180 degrees apart.
+
+    :param x: (INT) X component.
+    :param y: (INT) Y component.
+    :param start: (INT) First angle.
+    :param end: (INT) Second angle.
+    :return: (BOOL)
+    """
+    return cos(start) * y - sin(start) * x > 0 and x * sin(end) - y * cos(end) > 0
+
+
+class FixedBall:
+    """
+    Ball state in fixed point.
+    """
+    def __init__(self, ball: object = None):
+        """
+        Init the ball from a float Ball config.
+
+        :param ball: (OBJECT) Ball with the config. A new one if None.
+        """
+        ball = ball if ball is not None else Ball()
+
+        self.init_speed = round(ball.init_speed * ONE / SUBSTEPS_PER_SECOND)
+        self.speed_increment = round(ball.speed_increment * ONE / SUBSTEPS_PER_SECOND)
+        self.max_angle = round(ball.max_angle)
+        self.side = round(ball.diameter / 2 * ONE)
+
+        self.x = self.y = self.vx = self.vy = self.speed = 0
+        self.relocate(-1)
+
+    def relocate(self, direction: int) -> None:
+        """
+        Same as Ball.relocate().
+
+        :param direction: (INT) -1 to start moving on left side or 1 to the right side.
+        :return:
+        """
+        self.speed = self.init_speed
+        self.x = self.y = 0
+        self.vx, self.vy = scale_to(direction * ONE, ONE // 5, self.init_speed)
+
+    def bounce(self, offset: int) -> None:
+        """
+        Same as Ball.bounce(), with the angle rounded to whole degrees.
+
+        :param offset: (INT) Distance between ball and paddle centers (the angle in degrees).
+        :return:
+        """
+        self.speed += self.speed_increment
+        x, y = scale_to(-self.vx, self.vy, self.speed)
+
+        angle = max(-90, min(90, (offset + HALF) >> SHIFT))
+        rotated_x = div(x * cos(angle) - y * sin(angle), ONE)
+        rotated_y = div(x * sin(angle) + y * cos(angle), ONE)
+
+        # Same quadrants as Vector.is_over_angle_limit().
+        limit = self.max_angle
+        if is_between(rotated_x, rotated_y, limit, 90 + limit) or is_between(rotated_x, rotated_y, 270 - limit, 270 + limit):
+            self.vx, self.vy = x, y
+        else:
+            self.vx, self.vy = rotated_x, rotated_y
+
+
+class FixedPaddle:
+    """
+    Paddle (IA or human) state in fixed point.
+    """
+    def __init__(self, num_player: int, is_ia: bool = True, speed: float = None):
+        """
+        Init the paddle from the float Paddle config.
+
+        :param num_player: (INT) Number of player (1 or 2).
+        :param is_ia: (BOOL) Computer controlled, or moved by .command.
+        :param speed: (FLOAT) Speed in pixels per second. PLAYER_SPEED default if None.
+        """
+        paddle = Paddle(num_player=num_player)
+
+        self.num_player = num_player
+        self.is_ia = is_ia
+        self.command = "hold"
+        self.speed = round((speed if speed is not None else PLAYER_SPEED["ia" if is_ia else "human"]) * ONE / SUBSTEPS_PER_SECOND)
+        self.x = round(paddle.pos.x * ONE)
+        self.y = 0
+        self.half_width = round(paddle.width / 2 * ONE)
+        self.half_height = round(paddle.height / 2 * ONE)
+        self.reach = round(paddle.height / paddle.block_length * ONE)
+        self.score = 0
+
+        self.prediction = None
+        self.planned_vector = None
+
+    def collision(self, ball: object) -> bool:
+        """
+        Same as Ball.collision().
+
+        :param ball: (OBJECT) FixedBall
+        :return: (BOOL)
+        """
+        return not (ball.x + ball.side < self.x - self.half_width or ball.y + ball.side < self.y - self.half_height
+                    or ball.x - ball.side > self.x + self.half_width or ball.y - ball.side > self.y + self.half_height)
+
+    def calculate_bounces(self, ball: object) -> None:
+        """
+        Same as IA.calculate_bounces(): contact Y cord on the paddle face, folded into the map.
+
+        :param ball: (OBJECT) FixedBall
+        :return:
+        """
+        face = self.x + (self.half_width + ball.side if ball.vx < 0 else -(self.half_width + ball.side))
+        distance = face - ball.x
+        y = ball.y if (distance < 0) == (ball.vx > 0) and distance != 0 else ball.y + div(ball.vy * distance, ball.vx)
+
+        low = LIMITS["-y"]
+        span = LIMITS["y"] - low
+        y = (y - low) % (2 * span)
+
+        self.prediction = low + (y if y <= span else 2 * span - y)
+        self.planned_vector = (ball.vx, ball.vy)
+
+    def direction(self, ball: object) -> str:
+        """
+        Same as IA.direction() (or the human command).
+
+        :param ball: (OBJECT) FixedBall
+        :return: (STR) "up", "down" or "hold"
+        """
+        if not self.is_ia:
+            return self.command
+
+        if (self.num_player == 1 and ball.vx > 0) or (self.num_player == 2 and ball.vx < 0):
+            ideal = 0
+            self.prediction = None
+            self.planned_vector = None
+        else:
+            if self.planned_vector != (ball.vx, ball.vy):
+                self.calculate_bounces(ball=ball)
+            ideal = self.prediction
+
+        if ideal - ball.side < self.y - self.reach:
+            return "down"
+        elif ideal + ball.side > self.y + self.reach:
+            return "up"
+
+        return "hold"
+
+    def move(self, substeps: int, direction: str) -> None:
+        """
+        Same as Paddle.move(): whole pixels per frame.
+
+        :param substeps: (INT) Substeps of the frame.
+        :param direction: (STR) "up", "down" or "hold"
+        :return:
+        """
+        distance = ((self.speed * substeps + HALF) >> SHIFT) << SHIFT
+
+        if direction == "up" and self.y + self.half_height < LIMITS["y"]:
+            self.y += distance
+        elif direction == "down" and self.y - self.half_height > LIMITS["-y"]:
+            self.y -= distance
+
+
+class FixedMatch:
+    """
+    Deterministic match in fixed point.
+    """
+    def __init__(self, players: list = None, ball: object = None):
+        """
+        Init the match entities.
+
+        :param players: (LIST) Two FixedPaddle. Two IA by default.
+        :param ball: (OBJECT) FixedBall. A new one by default.
+        """
+        self.players = players if players is not None else [FixedPaddle(1), FixedPaddle(2)]
+        self.ball = ball if ball is not None else FixedBall()
+
+    def step(self, delta: float) -> None:
+        """
+        Advance the match one frame, same as Match.step() in substep mode.
+
+        :param delta: (FLOAT) Frame time (only used to get the number of substeps).
+        :return:
+        """
+        substeps = math.floor(delta / SUBSTEP)
+        ball = self.ball
+        first, second = self.players
+
+        for player in self.players:
+            player.move(substeps=substeps, direction=player.direction(ball=ball))
+
+        for i in range(substeps):
+            ball.x += ball.vx
+            ball.y += ball.vy
+
+            # Goal on each player side.
+            if ball.x < LIMITS["-x"]:
+                second.score += 1
+                ball.relocate(1)
+            elif ball.x > LIMITS["x"]:
+                first.score += 1
+                ball.relocate(-1)
+
+            # Map sides
+            if ball.y > LIMITS["y"] or ball.y < LIMITS["-y"]:
+                ball.vy = -ball.vy
+
+            # Ball collision on paddle.
+            if ball.vx < 0 and first.collision(ball):
+                ball.bounce(ball.y - first.y)
+            elif ball.vx > 0 and second.collision(ball):
+                ball.bounce(second.y - ball.y)
+
+    def positions(self) -> tuple:
+        """
+        Float positions for drawing.
+
+        :return: (TUPLE) Ball X, ball Y, paddle 1 Y, paddle 2 Y.
+        """
+        return self.ball.x / ONE, self.ball.y / ONE, self.players[0].y / ONE, self.players[1].y / ONE
+
+    def state(self) -> tuple:
+        """
+        Whole integer state.
+
+        :return: (TUPLE) Ball x, y, vx, vy, speed, paddles Y and scores.
+        """
+        ball = self.ball
+        first, second = self.players
+
+        return ball.x, ball.y, ball.vx, ball.vy, ball.speed, first.y, second.y, first.score, second.score
+
+    def digest(self, frames: int, delta: float = 0.05) -> str:
+        """
+        Play some frames and hash the state after each of them. Equal digests mean bit-identical trajectories.
+
+        :param frames: (INT) Number of frames.
+        :param delta: (FLOAT) Frame time.
+        :return: (STR) SHA-256 hex digest.
+        """
+        digest = hashlib.sha256()
+        for frame in range(frames):
+            self.step(delta)
+            digest.update(struct.pack("<9q", *self.state()))
+
+        return digest.hexdigest()
+
+
+def main() -> None:
+    """
+    Print the trajectory digest and compare the speed against the float engine.
+
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Deterministic fixed point physics check.")
+    parser.add_argument("--frames", type=int, default=100000, help="frames to play")
+    args = parser.parse_args()
+
+    match = FixedMatch()
+    started = time.perf_counter()
+    digest = match.digest(frames=args.frames)
+    fixed_time = time.perf_counter() - started
+
+    float_match = Match()
+    started = time.perf_counter()
+    for frame in range(args.frames):
+        float_match.step(0.05)
+    float_time = time.perf_counter() - started
+
+    print(f"digest {digest}")
+    print(f"score {match.players[0].score}-{match.players[1].score}")
+    print(f"fixed {fixed_time / args.frames * 1e6:.2f} us/frame (digest included), float {float_time / args.frames * 1e6:.2f} us/frame")
+
+
+if __name__ == "__main__":
+    main()
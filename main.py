@@ -1,56 +1,109 @@
-import math
+import atexit
+import os
 import time
+import engine
+from engine import Match
 from classes import Game, Player, IA, Ball
+from scheduler import SimulationThread, pace
+from controls import Keyboard
+from profiler import FrameProfiler
+from replay import Recorder
+from telemetry import EventWriter
+
+# Set PONG_PROFILE to a file path to profile each frame and save the timing histograms there at exit.
+# The simulation thread ones go to the same path with ".simulation" before the extension.
+PROFILE = os.environ.get("PONG_PROFILE")
+# Set PONG_RECORD to a file path to save a replay of the game (see replay.py).
+RECORD = os.environ.get("PONG_RECORD")
+# Set PONG_EVENTS to a .jsonl or .csv file path to save the ball events (see telemetry.py).
+EVENTS = os.environ.get("PONG_EVENTS")
 
 def startup():
     """
-    Game startup and loop.
+    Game startup and loop. The simulation runs on its own thread and this one only draws its latest snapshot.
 
     :return:
     """
-    # Init entities.
-    players = [IA(1), IA(2)] # Could be Player class or IA class.
-    ball = Ball()
-
-    # Main game variables
-    passed_time = time.time()
-
-    while not game.stop:
-        delta = (time.time() - passed_time) * 5
-        passed_time = time.time()
-
-        # Prevent screen being shown when moving entities.
-        game.screen.tracer(0)
-
-        # Update user cords.
-        game.screen.listen()
-        if players[0].is_ia == False:
-            game.screen.onkeypress(lambda: players[0].move(time=delta, direction="up"), key="w")
-            game.screen.onkeypress(lambda: players[0].move(time=delta, direction="down"), key="s")
-        if players[1].is_ia == False:
-            game.screen.onkeypress(lambda: players[1].move(time=delta, direction="up"), key="Up")
-            game.screen.onkeypress(lambda: players[1].move(time=delta, direction="down"), key="Down")
-
-        # Update IA cords.
-        if players[0].is_ia:
-            direction1 = players[0].direction(ball=ball)
-            players[0].move(time=delta, direction=direction1)
-        if players[1].is_ia:
-            direction2 = players[1].direction(ball=ball)
-            players[1].move(time=delta, direction=direction2)
-
-        # Update Ball movement cords.
-        quantum = math.floor(delta/0.005)
-        for i in range(quantum):
-            ball.move(players=players, time=0.005)
-
-        # Update entities position on the game (Player or IA and Ball)
-        for player in players:
-            player.place_position()
-        ball.place_position()
-
-        # Update main screen with all the changes.
-        game.screen.update()
+    # Init entities. The simulated ones are headless, the drawn ones take their state from the snapshots.
+    players = [engine.IA(1), engine.IA(2)] # Could be Player class or IA class.
+    ball = engine.Ball()
+    match = Match(players=players, ball=ball, continuous=True)
+    view = Match(players=[(IA if player.is_ia else Player)(player.num_player) for player in players], ball=Ball())
+
+    # Human keys are bound only once.
+    keyboard = Keyboard(game.screen)
+    keyboard.bind(players)
+
+    def update(delta: float) -> None:
+        """
+        Advance the game one fixed tick (on the simulation thread).
+
+        :param delta: (FLOAT) Game time of the tick.
+        :return:
+        """
+        # Update user commands from the keys held.
+        keyboard.apply(players)
+
+        # Update Player, IA and Ball movement cords.
+        match.step(delta)
+
+    simulation = SimulationThread(match=match, update=update)
+
+    if PROFILE:
+        root, extension = os.path.splitext(PROFILE)
+        simulation.profiler = match.profiler = FrameProfiler()
+        game.profiler = FrameProfiler()
+        game.simulation_profiler = simulation.profiler
+        atexit.register(simulation.profiler.dump, f"{root}.simulation{extension}")
+        atexit.register(game.profiler.dump, PROFILE)
+
+    if RECORD:
+        recorder = Recorder(RECORD, match)
+        atexit.register(recorder.close)
+
+    if EVENTS:
+        writer = EventWriter(EVENTS)
+        ball.events = writer.events
+        atexit.register(writer.close)
+
+    # Registered last so it runs first at exit, before the recorder and the event writer are closed.
+    atexit.register(simulation.stop)
+
+    shown = {"tick": None, "vector": None}
+
+    def render() -> None:
+        """
+        Draw the latest snapshot, between its tick and the one before.
+
+        :return:
+        """
+        snapshot = simulation.latest()
+        if snapshot is None:
+            return
+        tick, published, state = snapshot
+
+        if tick != shown["tick"]:
+            scores = [player.score.current_score for player in view.players]
+            view.restore(state)
+            shown["tick"] = tick
+
+            for player, score in zip(view.players, scores):
+                if player.score.current_score != score:
+                    player.score.refresh()
+            vector = (view.ball.vector.x, view.ball.vector.y)
+            if vector != shown["vector"]:
+                view.ball.draw_angle()
+                shown["vector"] = vector
+
+        # Update entities position on the game (Player or IA and Ball) and the main screen with all the changes.
+        alpha = min((time.perf_counter() - published) / simulation.tick, 1)
+        game.render(players=view.players, ball=view.ball, alpha=alpha)
+
+    # Prevent screen being shown when moving entities.
+    game.screen.tracer(0)
+
+    simulation.start()
+    pace(render, running=lambda: not game.stop)
 
 
 # Game Startup
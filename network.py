@@ -0,0 +1,619 @@
+"""
+Authoritative UDP server and client of the game on asyncio.
+
+The server owns the only real Match and steps it at a fixed tick. Clients only send their inputs (the direction of
+each local tick, numbered, resent until the server acknowledges them so a lost packet doesn't lose an input), and the
+server sends back the state of each tick delta-compressed against the last state the client acknowledged: a bit mask
+plus the Match.snapshot() doubles that changed. Clients move their own paddle as soon as the key is pressed, and when a
+state arrives they take it and replay the inputs the server didn't process yet, so the paddle feels local even with
+50-100 ms of latency. Seats without a client are played by the IA.
+
+LossyLink wraps a transport to add latency, jitter and packet loss, so all of it can be tried on localhost.
+
+Run: python network.py server [--port 5005]
+     python network.py client [--seat 1] [--bot]
+     python network.py demo [--seconds 10] [--latency 0.04 --jitter 0.01 --loss 0.05]
+"""
+import argparse
+import asyncio
+import random
+import struct
+from engine import TIMING, Player, IA, Ball, Match
+
+# Join request: type, seat wanted (0 = any).
+JOIN = struct.Struct("<cB")
+# Join answer: type, seat given (0 = match full), game time of a tick, real seconds of a tick.
+WELCOME = struct.Struct("<cBdd")
+# Inputs: type, last server tick received, sequence of the first input, number of inputs, then a direction per byte.
+INPUT = struct.Struct("<cIIB")
+# State: type, server tick, baseline tick (0 = full state), last input processed, mask of the doubles sent.
+STATE = struct.Struct("<cIIII")
+DIRECTIONS = ("hold", "up", "down")
+CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+# States kept on each side to delta-compress against.
+HISTORY = 64
+# Inputs resent on each packet at most.
+MAX_INPUTS = 32
+
+
+def encode(state: bytes, baseline: bytes = None) -> tuple:
+    """
+    Delta-compress a Match.snapshot() against an older one.
+
+    :param state: (BYTES) State to send.
+    :param baseline: (BYTES) State the receiver already has. Everything is sent if None.
+    :return: (TUPLE) Mask of the doubles sent and their bytes.
+    """
+    mask = 0
+    changed = []
+
+    for index in range(len(state) // 8):
+        value = state[index * 8:index * 8 + 8]
+        # Compared as bytes, so NaN (an IA without prediction) counts as unchanged.
+        if baseline is None or value != baseline[index * 8:index * 8 + 8]:
+            mask |= 1 << index
+            changed.append(value)
+
+    return mask, b"".join(changed)
+
+
+def decode(mask: int, data: bytes, baseline: bytes) -> bytes:
+    """
+    Rebuild a state from its delta.
+
+    :param mask: (INT) Mask of the doubles sent.
+    :param data: (BYTES) Their bytes.
+    :param baseline: (BYTES) State the delta was made against (any state of the same size for a full one).
+    :return: (BYTES) State for Match.restore().
+    """
+    state = bytearray(baseline)
+    offset = 0
+
+    for index in range(len(state) // 8):
+        if mask & (1 << index):
+            state[index * 8:index * 8 + 8] = data[offset:offset + 8]
+            offset += 8
+
+    return bytes(state)
+
+
+def seat(match: object, index: int, kind: type) -> object:
+    """
+    Replace a paddle of the match by another kind (Player or IA) on the same position and score.
+
+    :param match: (OBJECT) Match.
+    :param index: (INT) Paddle index (0 or 1).
+    :param kind: (CLASS) Player or IA.
+    :return: (OBJECT) The new paddle.
+    """
+    old = match.players[index]
+    paddle = kind(index + 1)
+    paddle.pos.assign(old.pos)
+    paddle.last_pos.assign(old.last_pos)
+    paddle.score.current_score = old.score.current_score
+    match.players[index] = paddle
+
+    return paddle
+
+
+class LossyLink:
+    """
+    Transport wrapper that delays and drops the datagrams sent.
+    """
+    def __init__(self, transport: object, latency: float = 0, jitter: float = 0, loss: float = 0, seed: int = None):
+        """
+        Init the link.
+
+        :param transport: (OBJECT) asyncio datagram transport.
+        :param latency: (FLOAT) One way delay in seconds.
+        :param jitter: (FLOAT) Max random change of the delay in seconds (so packets can arrive out of order).
+        :param loss: (FLOAT) Probability of dropping a packet (0 to 1).
+        :param seed: (INT) Random seed.
+        """
+        self.transport = transport
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.random = random.Random(seed)
+        self.loop = asyncio.get_running_loop()
+        self.sent = 0
+        self.dropped = 0
+
+    def sendto(self, data: bytes, addr: tuple = None) -> None:
+        """
+        Send a datagram later, or never.
+
+        :param data: (BYTES) Datagram.
+        :param addr: (TUPLE) Destination address.
+        :return:
+        """
+        self.sent += 1
+        if self.random.random() < self.loss:
+            self.dropped += 1
+            return
+
+        delay = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+        if delay:
+            self.loop.call_later(delay, self.send_now, data, addr)
+        else:
+            self.send_now(data, addr)
+
+    def send_now(self, data: bytes, addr: tuple) -> None:
+        """
+        Send a datagram unless the transport was closed meanwhile.
+
+        :param data: (BYTES) Datagram.
+        :param addr: (TUPLE) Destination address.
+        :return:
+        """
+        if not self.transport.is_closing():
+            self.transport.sendto(data, addr)
+
+    def close(self) -> None:
+        """
+        Close the transport.
+
+        :return:
+        """
+        self.transport.close()
+
+
+class Remote:
+    """
+    A client as seen by the server.
+    """
+    def __init__(self, addr: tuple, index: int):
+        """
+        Init the client state.
+
+        :param addr: (TUPLE) Client address.
+        :param index: (INT) Paddle index.
+        """
+        self.addr = addr
+        self.index = index
+        self.inputs = {} # Sequence: direction, not processed yet.
+        self.processed = 0 # Last input sequence processed.
+        self.ack = 0 # Last server tick the client received.
+        self.last_seen = 0.0
+
+
+class Server(asyncio.DatagramProtocol):
+    """
+    Authoritative match server.
+    """
+    def __init__(self, match: object = None, tick_rate: float = TIMING["tick_rate"], game_speed: float = TIMING["game_speed"], link: dict = None):
+        """
+        Init the server.
+
+        :param match: (OBJECT) Match to serve. A new one with two IA by default.
+        :param tick_rate: (FLOAT) Ticks per second.
+        :param game_speed: (FLOAT) Game time passed per real second.
+        :param link: (DICT) LossyLink arguments for the packets sent, None for a plain link.
+        """
+        self.match = match if match is not None else Match()
+        self.tick = 1 / tick_rate
+        self.delta = self.tick * game_speed
+        self.link = link
+        self.transport = None
+
+        self.ticks = 0
+        self.history = {} # Server tick: state.
+        self.remotes = {} # Address: Remote.
+        # Inputs a client can get ahead before the extra ones are processed on the same tick.
+        self.input_buffer = 2
+        self.timeout = 5.0
+        self.state_bytes = 0
+        self.states_sent = 0
+
+    def connection_made(self, transport: object) -> None:
+        """
+        Keep the transport.
+
+        :param transport: (OBJECT) asyncio datagram transport.
+        :return:
+        """
+        self.transport = LossyLink(transport, **self.link) if self.link else transport
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        """
+        Handle a join or the inputs of a client.
+
+        :param data: (BYTES) Datagram.
+        :param addr: (TUPLE) Sender address.
+        :return:
+        """
+        kind = data[:1]
+        remote = self.remotes.get(addr)
+
+        if kind == b"J":
+            if remote is None:
+                remote = self.join(addr, JOIN.unpack_from(data)[1])
+            self.transport.sendto(WELCOME.pack(b"W", 0 if remote is None else remote.index + 1, self.delta, self.tick), addr)
+        elif kind == b"I" and remote is not None:
+            remote.last_seen = asyncio.get_running_loop().time()
+            kind, ack, first, count = INPUT.unpack_from(data)
+            remote.ack = max(remote.ack, ack)
+
+            for sequence, code in enumerate(data[INPUT.size:INPUT.size + count], start=first):
+                if sequence > remote.processed:
+                    remote.inputs[sequence] = DIRECTIONS[code]
+
+    def join(self, addr: tuple, wanted: int) -> object:
+        """
+        Give a free seat to a new client.
+
+        :param addr: (TUPLE) Client address.
+        :param wanted: (INT) Seat wanted (1 or 2), 0 for any.
+        :return: (OBJECT) Remote, or None if there is no free seat.
+        """
+        taken = {remote.index for remote in self.remotes.values()}
+        free = [index for index in range(len(self.match.players)) if index not in taken]
+        if wanted and wanted - 1 in free:
+            free = [wanted - 1]
+        if not free:
+            return None
+
+        remote = Remote(addr, free[0])
+        remote.last_seen = asyncio.get_running_loop().time()
+        self.remotes[addr] = remote
+        seat(self.match, remote.index, Player)
+
+        return remote
+
+    def step(self) -> None:
+        """
+        Apply the inputs, step the match and send the new state to every client.
+
+        :return:
+        """
+        now = asyncio.get_running_loop().time()
+        for addr, remote in list(self.remotes.items()):
+            if now - remote.last_seen > self.timeout:
+                del self.remotes[addr]
+                seat(self.match, remote.index, IA)
+                continue
+
+            player = self.match.players[remote.index]
+            commands = []
+            # One input per tick, and the extra ones when the client got ahead (jitter, or a burst after a loss).
+            while remote.inputs and (not commands or len(remote.inputs) > self.input_buffer):
+                remote.processed = min(remote.inputs)
+                commands.append(remote.inputs.pop(remote.processed))
+
+            for command in commands[:-1]:
+                player.move(time=self.delta, direction=command)
+            player.command = commands[-1] if commands else "hold"
+
+        self.match.step(self.delta)
+        self.ticks += 1
+
+        state = self.match.snapshot()
+        self.history[self.ticks] = state
+        self.history.pop(self.ticks - HISTORY, None)
+
+        for remote in self.remotes.values():
+            baseline = self.history.get(remote.ack)
+            mask, data = encode(state, baseline)
+            packet = STATE.pack(b"S", self.ticks, remote.ack if baseline is not None else 0, remote.processed, mask) + data
+            self.transport.sendto(packet, remote.addr)
+            self.state_bytes += len(packet)
+            self.states_sent += 1
+
+    async def run(self, seconds: float = None) -> None:
+        """
+        Tick at a fixed rate.
+
+        :param seconds: (FLOAT) Time to run, forever if None.
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        started = next_tick = loop.time()
+
+        while seconds is None or loop.time() - started < seconds:
+            self.step()
+            next_tick += self.tick
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+
+class Client(asyncio.DatagramProtocol):
+    """
+    Client predicting its own paddle.
+    """
+    def __init__(self, controller: object, match: object = None, seat: int = 0, link: dict = None):
+        """
+        Init the client.
+
+        :param controller: (FUNCTION) Called with the match and the own paddle on each tick, returns the direction.
+        :param match: (OBJECT) Local match, only used to hold the state (never stepped). Two Player and a Ball by default.
+        :param seat: (INT) Seat wanted (1 or 2), 0 for any.
+        :param link: (DICT) LossyLink arguments for the packets sent, None for a plain link.
+        """
+        self.controller = controller
+        self.match = match if match is not None else Match(players=[Player(1), Player(2)], ball=Ball())
+        self.wanted = seat
+        self.link = link
+        self.transport = None
+
+        self.seat = None # Paddle index once welcomed.
+        self.refused = False
+        self.delta = None
+        self.tick = None
+        self.sequence = 0
+        self.pending = [] # (sequence, direction) sent but not processed by the server yet.
+        self.history = {} # Server tick: state.
+        self.server_tick = 0
+        self.states = 0
+        self.corrections = 0
+        self.max_correction = 0.0
+
+    def connection_made(self, transport: object) -> None:
+        """
+        Keep the transport and ask for a seat.
+
+        :param transport: (OBJECT) asyncio datagram transport.
+        :return:
+        """
+        self.transport = LossyLink(transport, **self.link) if self.link else transport
+        self.transport.sendto(JOIN.pack(b"J", self.wanted))
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        """
+        Handle the welcome or a state.
+
+        :param data: (BYTES) Datagram.
+        :param addr: (TUPLE) Sender address.
+        :return:
+        """
+        kind = data[:1]
+
+        if kind == b"W" and self.seat is None:
+            kind, seat, self.delta, self.tick = WELCOME.unpack_from(data)
+            self.refused = seat == 0
+            if not self.refused:
+                self.seat = seat - 1
+        elif kind == b"S" and self.seat is not None:
+            kind, tick, baseline_tick, processed, mask = STATE.unpack_from(data)
+            if tick <= self.server_tick:
+                return # Older than the state we have (reordered).
+
+            baseline = self.history.get(baseline_tick) if baseline_tick else self.match.snapshot()
+            if baseline is None:
+                return # Baseline already forgotten, the next state will use a newer one.
+
+            state = decode(mask, data[STATE.size:], baseline)
+            history = self.history
+            history[tick] = state
+            # Lost packets leave gaps in the ticks, so drop every state out of the window, not only tick - HISTORY.
+            # The ticks only go up (older states are ignored above), so the oldest ones are the first keys.
+            oldest = next(iter(history))
+            while oldest <= tick - HISTORY:
+                del history[oldest]
+                oldest = next(iter(history))
+            self.server_tick = tick
+            self.states += 1
+            self.reconcile(state, processed)
+
+    def reconcile(self, state: bytes, processed: int) -> None:
+        """
+        Take the server state and replay the own inputs the server didn't process yet.
+
+        :param state: (BYTES) Server state.
+        :param processed: (INT) Last own input processed by the server.
+        :return:
+        """
+        paddle = self.match.players[self.seat]
+        predicted = paddle.pos.y
+
+        self.match.restore(state)
+        self.pending = [(sequence, direction) for sequence, direction in self.pending if sequence > processed]
+        for sequence, direction in self.pending:
+            paddle.move(time=self.delta, direction=direction)
+
+        correction = abs(paddle.pos.y - predicted)
+        if correction:
+            self.corrections += 1
+            self.max_correction = max(self.max_correction, correction)
+
+    def step(self) -> None:
+        """
+        Read the own direction, move the own paddle and send the inputs not processed yet.
+
+        :return:
+        """
+        paddle = self.match.players[self.seat]
+        direction = self.controller(self.match, paddle)
+
+        self.sequence += 1
+        self.pending.append((self.sequence, direction))
+        paddle.last_pos.assign(paddle.pos)
+        paddle.move(time=self.delta, direction=direction)
+
+        inputs = self.pending[-MAX_INPUTS:]
+        self.transport.sendto(INPUT.pack(b"I", self.server_tick, inputs[0][0], len(inputs)) + bytes(CODES[direction] for sequence, direction in inputs))
+
+    async def run(self, render: object = None, seconds: float = None) -> None:
+        """
+        Join and tick at the server rate.
+
+        :param render: (FUNCTION) Called with the match after each tick.
+        :param seconds: (FLOAT) Time to run, forever if None.
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        while self.seat is None:
+            await asyncio.sleep(0.5)
+            if self.refused:
+                raise ConnectionRefusedError("the match is full")
+            if self.seat is None:
+                self.transport.sendto(JOIN.pack(b"J", self.wanted))
+
+        next_tick = loop.time()
+        while seconds is None or loop.time() - started < seconds:
+            self.step()
+            if render is not None:
+                render(self.match)
+            next_tick += self.tick
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+
+def bot() -> object:
+    """
+    Controller moving the paddle like the IA, on the client side state.
+
+    :return: (FUNCTION) Controller.
+    """
+    ias = {}
+
+    def controller(match: object, paddle: object) -> str:
+        if paddle.num_player not in ias:
+            ias[paddle.num_player] = IA(paddle.num_player)
+        ia = ias[paddle.num_player]
+        ia.pos.y = paddle.pos.y
+        return ia.direction(ball=match.ball)
+
+    return controller
+
+
+async def serve(host: str, port: int, link: dict = None, seconds: float = None) -> object:
+    """
+    Run a server.
+
+    :param host: (STR) Address to listen on.
+    :param port: (INT) UDP port.
+    :param link: (DICT) LossyLink arguments.
+    :param seconds: (FLOAT) Time to run, forever if None.
+    :return: (OBJECT) Server
+    """
+    loop = asyncio.get_running_loop()
+    transport, server = await loop.create_datagram_endpoint(lambda: Server(link=link), local_addr=(host, port))
+    try:
+        await server.run(seconds=seconds)
+    finally:
+        transport.close()
+
+    return server
+
+
+async def connect(host: str, port: int, controller: object, seat: int = 0, link: dict = None, render: object = None, seconds: float = None, match: object = None) -> object:
+    """
+    Run a client.
+
+    :param host: (STR) Server address.
+    :param port: (INT) Server UDP port.
+    :param controller: (FUNCTION) See Client.
+    :param seat: (INT) Seat wanted (1 or 2), 0 for any.
+    :param link: (DICT) LossyLink arguments.
+    :param render: (FUNCTION) Called with the match after each tick.
+    :param seconds: (FLOAT) Time to run, forever if None.
+    :param match: (OBJECT) Local match, see Client.
+    :return: (OBJECT) Client
+    """
+    loop = asyncio.get_running_loop()
+    transport, client = await loop.create_datagram_endpoint(lambda: Client(controller, match=match, seat=seat, link=link), remote_addr=(host, port))
+    try:
+        await client.run(render=render, seconds=seconds)
+    finally:
+        transport.close()
+
+    return client
+
+
+async def demo(port: int, link: dict, seconds: float) -> None:
+    """
+    Server and two bot clients on localhost, over the simulated link.
+
+    :param port: (INT) UDP port.
+    :param link: (DICT) LossyLink arguments, used on every side.
+    :param seconds: (FLOAT) Time to play.
+    :return:
+    """
+    server_task = asyncio.create_task(serve("127.0.0.1", port, link=link, seconds=seconds + 1))
+    await asyncio.sleep(0.1)
+    clients = await asyncio.gather(*(connect("127.0.0.1", port, bot(), seat=seat, link=link, seconds=seconds) for seat in (1, 2)))
+    server = await server_task
+
+    full = STATE.size + server.match.state.size
+    print(f"{server.ticks} ticks, score {server.match.players[0].score.current_score}-{server.match.players[1].score.current_score}")
+    print(f"state packets: {server.state_bytes / max(server.states_sent, 1):.0f} bytes avg, {full} bytes full")
+    for client in clients:
+        print(f"seat {client.seat + 1}: {client.states} states, {client.corrections} corrections (max {client.max_correction:.0f} px), {len(client.pending)} inputs pending")
+
+
+def view(host: str, port: int, seat: int, link: dict) -> None:
+    """
+    Play on the turtle screen with the keyboard.
+
+    :param host: (STR) Server address.
+    :param port: (INT) Server UDP port.
+    :param seat: (INT) Seat wanted (1 or 2), 0 for any.
+    :param link: (DICT) LossyLink arguments.
+    :return:
+    """
+    from classes import Game, Player as DrawnPlayer, Ball as DrawnBall
+    from controls import Keyboard
+
+    game = Game()
+    match = Match(players=[DrawnPlayer(1), DrawnPlayer(2)], ball=DrawnBall())
+    keyboard = Keyboard(game.screen)
+    bound = []
+
+    def controller(match: object, paddle: object) -> str:
+        if not bound:
+            keyboard.bind([paddle])
+            bound.append(paddle)
+        keyboard.apply([paddle])
+        return paddle.command
+
+    # Scores and ball vector last drawn. The client match is only restored from the server states, which doesn't
+    # call Scoreboard.update() or Ball.bounce(), so the texts are refreshed here when they changed (as in main.py).
+    shown = {"scores": [0] * len(match.players), "vector": None}
+
+    def render(match: object) -> None:
+        for index, player in enumerate(match.players):
+            if player.score.current_score != shown["scores"][index]:
+                player.score.refresh()
+                shown["scores"][index] = player.score.current_score
+        vector = (match.ball.vector.x, match.ball.vector.y)
+        if vector != shown["vector"]:
+            match.ball.draw_angle()
+            shown["vector"] = vector
+
+        game.render(players=match.players, ball=match.ball)
+
+    asyncio.run(connect(host, port, controller, seat=seat, link=link, render=render, match=match))
+
+
+def main() -> None:
+    """
+    Network command line.
+
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Authoritative UDP game server and client.")
+    parser.add_argument("mode", choices=("server", "client", "demo"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--seat", type=int, default=0, help="seat wanted by the client (1 or 2), any by default")
+    parser.add_argument("--bot", action="store_true", help="client played by the IA, without screen")
+    parser.add_argument("--seconds", type=float, default=None, help="time to run (demo: 10)")
+    parser.add_argument("--latency", type=float, default=0, help="simulated one way latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0, help="simulated latency jitter in seconds")
+    parser.add_argument("--loss", type=float, default=0, help="simulated packet loss (0 to 1)")
+    args = parser.parse_args()
+
+    link = {"latency": args.latency, "jitter": args.jitter, "loss": args.loss} if args.latency or args.jitter or args.loss else None
+
+    if args.mode == "server":
+        asyncio.run(serve(args.host, args.port, link=link, seconds=args.seconds))
+    elif args.mode == "demo":
+        asyncio.run(demo(args.port, link=link or {"latency": 0.04, "jitter": 0.01, "loss": 0.05}, seconds=args.seconds or 10))
+    elif args.bot:
+        asyncio.run(connect(args.host, args.port, bot(), seat=args.seat, link=link, seconds=args.seconds))
+    else:
+        view(args.host, args.port, args.seat, link)
+
+
+if __name__ == "__main__":
+    main()
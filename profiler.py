@@ -0,0 +1,157 @@
+"""
+Opt-in per frame profiling of the game loop.
+
+Times each phase of a frame (IA, physics, entity placement and screen update) plus the physics substeps, into a
+fixed size ring buffer, so recording costs a few float writes per frame and memory doesn't grow. When no profiler is
+set (the default) the game only pays a "profiler is None" check per phase.
+"""
+import json
+import statistics
+import time
+from array import array
+from bisect import bisect_right
+
+PHASES = ("ia", "physics", "place", "update")
+# Histogram bin edges in microseconds.
+BINS = (10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000)
+
+
+class FrameProfiler:
+    """
+    Ring buffer of the last frames timings.
+    """
+    def __init__(self, size: int = 4096):
+        """
+        Init the buffers.
+
+        :param size: (INT) Number of frames kept.
+        """
+        self.size = size
+        self.timings = {phase: array("d", [0.0]) * size for phase in PHASES} # Seconds per phase and frame.
+        self.substeps = array("l", [0]) * size
+        self.frames = 0 # Total frames recorded.
+
+        # Actual frame.
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.current_substeps = 0
+        self.last = time.perf_counter()
+
+    def begin(self) -> None:
+        """
+        Start timing a phase.
+
+        :return:
+        """
+        self.last = time.perf_counter()
+
+    def lap(self, phase: str, substeps: int = 0) -> None:
+        """
+        Add the time since .begin() or the last .lap() to a phase of the actual frame.
+
+        :param phase: (STR) One of PHASES.
+        :param substeps: (INT) Physics substeps done on this phase.
+        :return:
+        """
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.current_substeps += substeps
+        self.last = now
+
+    def end_frame(self) -> None:
+        """
+        Save the actual frame into the ring buffer.
+
+        :return:
+        """
+        index = self.frames % self.size
+
+        for phase in PHASES:
+            self.timings[phase][index] = self.current[phase]
+            self.current[phase] = 0.0
+        self.substeps[index] = self.current_substeps
+        self.current_substeps = 0
+
+        self.frames += 1
+
+    def recorded(self, phase: str) -> list:
+        """
+        Times of a phase on the frames kept, in microseconds.
+
+        :param phase: (STR) One of PHASES.
+        :return: (LIST) Microseconds per frame.
+        """
+        return [seconds * 1e6 for seconds in self.timings[phase][:min(self.frames, self.size)]]
+
+    def average(self, phase: str, count: int = 60) -> float:
+        """
+        Average of a phase (or the substeps) on the last frames.
+
+        :param phase: (STR) One of PHASES, or "substeps".
+        :param count: (INT) Last frames averaged.
+        :return: (FLOAT) Seconds (or substeps) per frame, 0 before the first frame.
+        """
+        count = min(self.frames, self.size, count)
+        if count == 0:
+            return 0.0
+
+        values = self.substeps if phase == "substeps" else self.timings[phase]
+
+        return sum(values[(self.frames - 1 - frame) % self.size] for frame in range(count)) / count
+
+    def overlay(self, simulation: object = None) -> str:
+        """
+        Short text with the average of the last frames, to show on the screen.
+
+        :param simulation: (OBJECT) Optional FrameProfiler of the simulation thread, the IA and physics times and the
+        substeps are taken from it (when the simulation runs on its own thread, this one only times the drawing).
+        :return: (STR) Overlay text.
+        """
+        if self.frames == 0:
+            return ""
+
+        source = {phase: self for phase in PHASES}
+        if simulation is not None:
+            source["ia"] = source["physics"] = simulation
+        text = " ".join(f"{phase} {source[phase].average(phase) * 1000:.2f}" for phase in PHASES)
+
+        return f"{text} ms | substeps {(simulation or self).average('substeps'):.0f}"
+
+    def histograms(self) -> dict:
+        """
+        Histogram and percentiles of each phase plus the substeps, on the frames kept.
+
+        :return: (DICT) Stats per phase.
+        """
+        stats = {"frames": self.frames, "bins_us": list(BINS)}
+
+        for phase in PHASES:
+            values = self.recorded(phase)
+            counts = [0] * (len(BINS) + 1)
+            for value in values:
+                counts[bisect_right(BINS, value)] += 1
+
+            stats[phase] = {
+                "counts": counts,
+                "mean_us": statistics.fmean(values) if values else 0,
+                "p50_us": statistics.median(values) if values else 0,
+                "p99_us": statistics.quantiles(values, n=100)[98] if len(values) > 1 else 0,
+                "max_us": max(values, default=0)
+            }
+
+        substeps = list(self.substeps[:min(self.frames, self.size)])
+        stats["substeps"] = {
+            "mean": statistics.fmean(substeps) if substeps else 0,
+            "max": max(substeps, default=0)
+        }
+
+        return stats
+
+    def dump(self, path: str) -> None:
+        """
+        Write the histograms into a JSON file.
+
+        :param path: (STR) File path.
+        :return:
+        """
+        with open(path, "w") as file:
+            json.dump(self.histograms(), file, indent=4)
@@ -0,0 +1,192 @@
+"""
+Headless NumPy renderer.
+
+Draws the arena (divider, paddles, ball and score digits) into a grayscale uint8 buffer that is reused on every
+frame: the static divider is drawn once into a background copied over the frame, and the entities are rectangle
+slices, so a frame allocates no array. The frame can be max-pooled into a smaller observation (thin objects like the
+ball stay visible) and written raw to a file or pipe, ex.: for ffmpeg "-f rawvideo -pix_fmt gray -s 800x500".
+
+Run: python raster.py [--frames 2000] [--downsample 4] [--output frames.raw | -]
+"""
+import argparse
+import sys
+import time
+import numpy as np
+from engine import MAP_DIMENSIONS, MAP_LIMITS, TIMING, Match, divider_blocks
+
+# 3x5 bitmaps of the score digits, a row per string.
+DIGITS = {
+    "0": ("111", "101", "101", "101", "111"),
+    "1": ("010", "110", "010", "010", "111"),
+    "2": ("111", "001", "111", "100", "111"),
+    "3": ("111", "001", "111", "001", "111"),
+    "4": ("101", "101", "111", "001", "001"),
+    "5": ("111", "100", "111", "001", "111"),
+    "6": ("111", "100", "111", "101", "111"),
+    "7": ("111", "001", "010", "010", "010"),
+    "8": ("111", "101", "111", "101", "111"),
+    "9": ("111", "101", "111", "001", "111")
+}
+WHITE = 255
+
+
+class Framebuffer:
+    """
+    Reusable frame of the arena.
+    """
+    def __init__(self, downsample: int = 1, digit_scale: int = 6):
+        """
+        Init the buffers and draw the background.
+
+        :param downsample: (INT) Observation pooling factor (1 = same size as the frame).
+        :param digit_scale: (INT) Pixels per score digit bitmap cell.
+        """
+        self.width = MAP_DIMENSIONS["width"]
+        self.height = MAP_DIMENSIONS["height"]
+        self.frame = np.zeros((self.height, self.width), dtype=np.uint8)
+        self.background = np.zeros_like(self.frame)
+        self.digit_scale = digit_scale
+        # Digit bitmaps scaled up once.
+        self._glyphs = {
+            digit: np.kron(np.array([[int(bit) for bit in bits] for bits in rows], dtype=np.uint8), np.full((digit_scale, digit_scale), WHITE, dtype=np.uint8))
+            for digit, rows in DIGITS.items()
+        }
+
+        self.downsample = downsample
+        self.observation = np.zeros((self.height // downsample, self.width // downsample), dtype=np.uint8)
+        # Max-pooled in two passes: the rows of each window into ._rows, then its columns into the observation.
+        rows, columns = self.observation.shape
+        self._rows = np.zeros((rows, columns * downsample), dtype=np.uint8)
+        self._row_windows = [self.frame[offset:rows * downsample:downsample, :columns * downsample] for offset in range(downsample)]
+        self._column_windows = [self._rows[:, offset::downsample] for offset in range(downsample)]
+
+        self.__draw_map_divider()
+
+    def __draw_map_divider(self) -> None:
+        """
+        Draw the divider blocks into the background, same placement as the turtle Game.
+
+        :return:
+        """
+        for y in divider_blocks():
+            self.fill(self.background, -3, y - 10, 3, y + 10)
+
+    def fill(self, buffer: object, left: float, bottom: float, right: float, top: float) -> None:
+        """
+        Fill a rectangle given in game cords (origin on the center, Y up), clipped to the buffer.
+
+        :param buffer: (ARRAY) Frame or background.
+        :param left: (FLOAT) Left X cord.
+        :param bottom: (FLOAT) Bottom Y cord.
+        :param right: (FLOAT) Right X cord.
+        :param top: (FLOAT) Top Y cord.
+        :return:
+        """
+        column_start = max(round(left + self.width / 2), 0)
+        column_end = min(round(right + self.width / 2), self.width)
+        row_start = max(round(self.height / 2 - top), 0)
+        row_end = min(round(self.height / 2 - bottom), self.height)
+
+        if column_start < column_end and row_start < row_end:
+            buffer[row_start:row_end, column_start:column_end] = WHITE
+
+    def text(self, text: str, x: float, y: float) -> None:
+        """
+        Draw the digits of a score centered on X, with its bottom on Y.
+
+        :param text: (STR) Digits.
+        :param x: (FLOAT) Center X cord.
+        :param y: (FLOAT) Bottom Y cord.
+        :return:
+        """
+        glyph_height, glyph_width = self._glyphs["0"].shape
+        column = round(x + self.width / 2 - (len(text) * glyph_width + (len(text) - 1) * self.digit_scale) / 2)
+        row = round(self.height / 2 - y) - glyph_height
+
+        for digit in text:
+            if column >= 0 and column + glyph_width <= self.width:
+                region = self.frame[row:row + glyph_height, column:column + glyph_width]
+                np.maximum(region, self._glyphs[digit], out=region)
+            column += glyph_width + self.digit_scale
+
+    def render(self, players: list, ball: object, alpha: float = 1) -> object:
+        """
+        Draw a frame. Same arguments as classes.Game.render().
+
+        :param players: (LIST) all players instances.
+        :param ball: (OBJECT) Ball instance.
+        :param alpha: (FLOAT) Interpolation factor between the last two ticks.
+        :return: (ARRAY) The frame buffer (overwritten by the next call).
+        """
+        np.copyto(self.frame, self.background)
+
+        for player in players:
+            x = player.last_pos.x + (player.pos.x - player.last_pos.x) * alpha
+            y = player.last_pos.y + (player.pos.y - player.last_pos.y) * alpha
+            self.fill(self.frame, x - player.width / 2, y - player.height / 2, x + player.width / 2, y + player.height / 2)
+            self.text(str(player.score.current_score), -40 if player.num_player == 1 else 40, MAP_LIMITS["y"] - 55)
+
+        x = ball.last_pos.x + (ball.pos.x - ball.last_pos.x) * alpha
+        y = ball.last_pos.y + (ball.pos.y - ball.last_pos.y) * alpha
+        half = ball.diameter / 2
+        self.fill(self.frame, x - half, y - half, x + half, y + half)
+
+        return self.frame
+
+    def observe(self) -> object:
+        """
+        Max-pool the last frame into the observation buffer.
+
+        :return: (ARRAY) The observation buffer (overwritten by the next call).
+        """
+        if self.downsample == 1:
+            np.copyto(self.observation, self.frame)
+            return self.observation
+
+        np.copyto(self._rows, self._row_windows[0])
+        for window in self._row_windows[1:]:
+            np.maximum(self._rows, window, out=self._rows)
+
+        np.copyto(self.observation, self._column_windows[0])
+        for window in self._column_windows[1:]:
+            np.maximum(self.observation, window, out=self.observation)
+
+        return self.observation
+
+
+def main() -> None:
+    """
+    Play a headless match and stream its frames.
+
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Headless NumPy rendering of a match.")
+    parser.add_argument("--frames", type=int, default=2000, help="frames to draw")
+    parser.add_argument("--downsample", type=int, default=1, help="stream observations max-pooled by this factor")
+    parser.add_argument("--output", help="raw frames file, - for stdout")
+    args = parser.parse_args()
+
+    match = Match(continuous=True)
+    framebuffer = Framebuffer(downsample=args.downsample)
+    delta = TIMING["game_speed"] / TIMING["tick_rate"]
+    output = None if args.output is None else (sys.stdout.buffer if args.output == "-" else open(args.output, "wb"))
+
+    started = time.perf_counter()
+    for frame in range(args.frames):
+        match.step(delta)
+        framebuffer.render(match.players, match.ball)
+        if args.downsample > 1:
+            framebuffer.observe()
+        if output is not None:
+            output.write(framebuffer.observation if args.downsample > 1 else framebuffer.frame)
+    elapsed = time.perf_counter() - started
+
+    if output is not None and output is not sys.stdout.buffer:
+        output.close()
+
+    height, width = framebuffer.observation.shape if args.downsample > 1 else framebuffer.frame.shape
+    print(f"{args.frames / elapsed:.0f} frames/s, {width}x{height} gray", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Compact binary replays of a match.
+
+The Recorder packs the match state after each step (ball position, vector and speed, paddles Y cord, scores and the
+direction each paddle moved) into fixed size records, buffered in a bytearray, so it costs about a microsecond per
+step and can stay on. The Replay memory-maps the file to jump to any frame, play it faster than real time and
+simulate again from any frame with the recorded inputs.
+
+Run: python replay.py game.rec [--check] [--frames 100:110]
+"""
+import argparse
+import mmap
+import struct
+import time
+from engine import Player, Ball, Match
+
+MAGIC = b"PONGREC1"
+# Magic, paddle 1 and 2 speeds, ball init speed, speed increment, max angle, continuous mode.
+HEADER = struct.Struct("<8s5d?")
+# Tick, delta, ball x, y, vector x, vector y, speed, paddle 1 and 2 Y cords, scores 1 and 2, directions.
+RECORD = struct.Struct("<Id5d2d2IB")
+DIRECTIONS = ("hold", "up", "down")
+CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+
+class Recorder:
+    """
+    Appends the state of a match after each step into a replay file.
+    """
+    def __init__(self, path: str, match: object, buffer_records: int = 1024):
+        """
+        Open the file, write the header and the initial state (frame 0), and attach to the match.
+
+        :param path: (STR) Replay file path.
+        :param match: (OBJECT) Match to record.
+        :param buffer_records: (INT) Records kept in memory before writing them to the file.
+        """
+        self.match = match
+        self.file = open(path, "wb")
+        self.buffer = bytearray(RECORD.size * buffer_records)
+        self.buffered = 0
+        self.tick = 0
+
+        ball = match.ball
+        self.file.write(HEADER.pack(MAGIC, match.players[0].speed, match.players[1].speed, ball.init_speed, ball.speed_increment, ball.max_angle, match.continuous))
+
+        self.record(0)
+        match.recorder = self
+
+    def record(self, delta: float) -> None:
+        """
+        Save the actual state. Called by Match.step().
+
+        :param delta: (FLOAT) Time of the step.
+        :return:
+        """
+        ball = self.match.ball
+        players = self.match.players
+        directions = self.match.directions
+
+        RECORD.pack_into(
+            self.buffer, self.buffered * RECORD.size,
+            self.tick, delta, ball.pos.x, ball.pos.y, ball.vector.x, ball.vector.y, ball.speed,
+            players[0].pos.y, players[1].pos.y, players[0].score.current_score, players[1].score.current_score,
+            CODES[directions[0]] | (CODES[directions[1]] << 2)
+        )
+        self.tick += 1
+        self.buffered += 1
+
+        if self.buffered * RECORD.size == len(self.buffer):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the buffered records.
+
+        :return:
+        """
+        self.file.write(memoryview(self.buffer)[:self.buffered * RECORD.size])
+        self.file.flush()
+        self.buffered = 0
+
+    def close(self) -> None:
+        """
+        Write the pending records, close the file and stop recording.
+
+        :return:
+        """
+        if self.file.closed:
+            return
+
+        self.flush()
+        self.file.close()
+        self.match.recorder = None
+
+
+class Replay:
+    """
+    Memory-mapped replay file.
+    """
+    def __init__(self, path: str):
+        """
+        Map the file and read its header.
+
+        :param path: (STR) Replay file path.
+        """
+        with open(path, "rb") as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, *config = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+
+        self.paddle_speeds = config[0:2]
+        self.init_speed, self.speed_increment, self.max_angle, self.continuous = config[2:]
+        # A half written last record (killed game) is ignored.
+        self.count = (len(self.map) - HEADER.size) // RECORD.size
+
+    def close(self) -> None:
+        """
+        Unmap the file. The frames iterators still running must be finished or dropped first.
+
+        :return:
+        """
+        self.map.close()
+
+    def __enter__(self) -> object:
+        """
+        :return: (OBJECT) The replay, closed at the end of the with block.
+        """
+        return self
+
+    def __exit__(self, *exception) -> None:
+        """
+        Close the replay.
+
+        :param exception: Exception type, value and traceback (not handled).
+        :return:
+        """
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        :return: (INT) Number of frames.
+        """
+        return self.count
+
+    def frame(self, index: int) -> tuple:
+        """
+        Read a frame without reading the ones before it.
+
+        :param index: (INT) Frame number (negative counts from the end).
+        :return: (TUPLE) Record fields (see RECORD).
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(f"frame {index} out of range")
+
+        return RECORD.unpack_from(self.map, HEADER.size + index * RECORD.size)
+
+    def frames(self, start: int = 0, stop: int = None) -> object:
+        """
+        Iterate the frames in a range.
+
+        :param start: (INT) First frame.
+        :param stop: (INT) Frame to stop at (excluded). End of the replay if None.
+        :return: (GENERATOR) Record fields of each frame.
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        if start >= stop:
+            return
+
+        # A view of the mapped pages, not a copy of the range. It's released when the generator ends or is dropped,
+        # so the file can be closed after.
+        yield from RECORD.iter_unpack(memoryview(self.map)[HEADER.size + start * RECORD.size:HEADER.size + stop * RECORD.size])
+
+    def play(self, render: object, start: int = 0, speed: float = 1, game_speed: float = 5) -> None:
+        """
+        Play the frames at the recorded pace multiplied by a speed factor.
+
+        :param render: (FUNCTION) Called with the record fields of each frame.
+        :param start: (INT) First frame.
+        :param speed: (FLOAT) Playback speed. 0 plays as fast as possible.
+        :param game_speed: (FLOAT) Game time per real second the match was played with.
+        :return:
+        """
+        for record in self.frames(start=start):
+            render(record)
+            if speed:
+                time.sleep(record[1] / game_speed / speed)
+
+    def match(self, index: int) -> object:
+        """
+        Build a match on the state of a frame. Both paddles are Player instances driven by the recorded directions.
+
+        :param index: (INT) Frame number.
+        :return: (OBJECT) Match
+        """
+        players = [Player(1), Player(2)]
+        for player, speed in zip(players, self.paddle_speeds):
+            player.speed = speed
+
+        ball = Ball()
+        ball.init_speed = self.init_speed
+        ball.speed_increment = self.speed_increment
+        ball.max_angle = self.max_angle
+
+        match = Match(players=players, ball=ball, continuous=self.continuous)
+        self.restore(match, index)
+
+        return match
+
+    def restore(self, match: object, index: int) -> None:
+        """
+        Put a match on the state of a frame.
+
+        :param match: (OBJECT) Match built by .match().
+        :param index: (INT) Frame number.
+        :return:
+        """
+        tick, delta, x, y, vector_x, vector_y, speed, paddle_1, paddle_2, score_1, score_2, directions = self.frame(index)
+
+        match.ball.pos.x, match.ball.pos.y = x, y
+        match.ball.last_pos.assign(match.ball.pos)
+        match.ball.vector.x, match.ball.vector.y = vector_x, vector_y
+        match.ball.speed = speed
+
+        for player, paddle_y, score in zip(match.players, (paddle_1, paddle_2), (score_1, score_2)):
+            player.pos.y = paddle_y
+            player.last_pos.assign(player.pos)
+            player.score.current_score = score
+
+    def resimulate(self, start: int = 0, stop: int = None) -> object:
+        """
+        Simulate again from a frame with the recorded deltas and directions.
+
+        :param start: (INT) Frame to start from.
+        :param stop: (INT) Frame to stop at (excluded). End of the replay if None.
+        :return: (GENERATOR) (frame number, match) after each simulated step.
+        """
+        match = self.match(start)
+
+        for record in self.frames(start=start + 1, stop=stop):
+            tick, delta, directions = record[0], record[1], record[-1]
+            match.players[0].command = DIRECTIONS[directions & 3]
+            match.players[1].command = DIRECTIONS[directions >> 2]
+            match.step(delta)
+
+            yield tick, match
+
+    def check(self, start: int = 0) -> int:
+        """
+        Simulate again from a frame and find the first frame that doesn't match the recording.
+
+        :param start: (INT) Frame to start from.
+        :return: (INT) First different frame, or -1 if all of them are the same.
+        """
+        for tick, match in self.resimulate(start=start):
+            ball = match.ball
+            players = match.players
+            state = (ball.pos.x, ball.pos.y, ball.vector.x, ball.vector.y, ball.speed, players[0].pos.y, players[1].pos.y, players[0].score.current_score, players[1].score.current_score)
+
+            if state != self.frame(tick)[2:-1]:
+                return tick
+
+        return -1
+
+
+def main() -> None:
+    """
+    Replay command line.
+
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Inspect and check a game replay.")
+    parser.add_argument("path", help="replay file")
+    parser.add_argument("--frames", help="print a range of frames, ex.: 100:110")
+    parser.add_argument("--check", type=int, nargs="?", const=0, metavar="FRAME", help="simulate again from a frame and compare with the recording")
+    args = parser.parse_args()
+
+    with Replay(args.path) as replay:
+        if not len(replay):
+            print(f"0 frames, continuous {replay.continuous}")
+            return
+
+        last = replay.frame(-1)
+        print(f"{len(replay)} frames, score {last[9]}-{last[10]}, continuous {replay.continuous}")
+
+        if args.frames:
+            start, stop = (int(value) for value in args.frames.split(":"))
+            for record in replay.frames(start=start, stop=stop):
+                print(record)
+
+        if args.check is not None:
+            started = time.perf_counter()
+            different = replay.check(start=args.check)
+            elapsed = time.perf_counter() - started
+            print(f"re-simulated from frame {args.check} in {elapsed:.2f}s: " + ("same as the recording" if different < 0 else f"first difference on frame {different}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+Server mode running many independent matches.
+
+Rooms are sharded across worker processes by id. Each worker holds its rooms on one asyncio event loop and ticks all
+of them at the fixed tick rate, in batches with a yield to the loop between batches, so other tasks (commands, IO)
+keep running while a big shard is ticked. Every worker reports its room count, tick lag, busy time and CPU time per
+room once per second.
+
+Run: python rooms.py --rooms 500 --workers 8 [--seconds 30]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+import zlib
+from engine import TIMING, Match
+
+
+def shard_of(room_id: object, shards: int) -> int:
+    """
+    Worker of a room. Stable across processes and runs (unlike hash()).
+
+    :param room_id: (OBJECT) Room id (str or int).
+    :param shards: (INT) Number of workers.
+    :return: (INT) Worker index.
+    """
+    return zlib.crc32(str(room_id).encode()) % shards
+
+
+class Room:
+    """
+    A match with its own stats.
+    """
+    def __init__(self, room_id: object, continuous: bool = True):
+        """
+        Init the room with an IA vs IA match.
+
+        :param room_id: (OBJECT) Room id.
+        :param continuous: (BOOL) Match continuous collision mode.
+        """
+        self.room_id = room_id
+        self.match = Match(continuous=continuous)
+        self.ticks = 0
+        self.cpu = 0.0 # CPU seconds spent on .step() (thread time, so preemption isn't counted).
+
+    def step(self, delta: float) -> None:
+        """
+        Advance the match one tick.
+
+        :param delta: (FLOAT) Game time of the tick.
+        :return:
+        """
+        started = time.thread_time()
+        self.match.step(delta)
+        self.cpu += time.thread_time() - started
+        self.ticks += 1
+
+
+class Shard:
+    """
+    Rooms of a worker, ticked on one event loop.
+    """
+    def __init__(self, shard_id: int, tick_rate: float = TIMING["tick_rate"], game_speed: float = TIMING["game_speed"], batch: int = 64, continuous: bool = True):
+        """
+        Init the shard.
+
+        :param shard_id: (INT) Worker index.
+        :param tick_rate: (FLOAT) Ticks per second.
+        :param game_speed: (FLOAT) Game time passed per real second.
+        :param batch: (INT) Rooms ticked before yielding to the event loop.
+        :param continuous: (BOOL) Match continuous collision mode of the new rooms.
+        """
+        self.shard_id = shard_id
+        self.tick = 1 / tick_rate
+        self.delta = self.tick * game_speed
+        self.batch = batch
+        self.continuous = continuous
+        self.rooms = {}
+        self.stopped = False
+        # Never catch up more than this many ticks late, the missed ones are skipped.
+        self.max_behind = 5
+
+        self.ticks = 0
+        self.skipped = 0
+        self.reset_window()
+
+    def reset_window(self) -> None:
+        """
+        Start a new stats window.
+
+        :return:
+        """
+        self.window_started = time.perf_counter()
+        self.window_ticks = 0
+        self.window_lag = 0.0
+        self.window_max_lag = 0.0
+        self.window_busy = 0.0
+        self.window_cpu = {room_id: room.cpu for room_id, room in self.rooms.items()}
+
+    def create(self, room_id: object) -> None:
+        """
+        Open a room.
+
+        :param room_id: (OBJECT) Room id.
+        :return:
+        """
+        if room_id not in self.rooms:
+            self.rooms[room_id] = Room(room_id, continuous=self.continuous)
+
+    def close(self, room_id: object) -> None:
+        """
+        Close a room.
+
+        :param room_id: (OBJECT) Room id.
+        :return:
+        """
+        self.rooms.pop(room_id, None)
+        self.window_cpu.pop(room_id, None)
+
+    async def step(self) -> None:
+        """
+        Tick every room once, yielding to the event loop after each batch.
+
+        :return:
+        """
+        rooms = list(self.rooms.values())
+
+        for start in range(0, len(rooms), self.batch):
+            # CPU time of the batch only, the other tasks run on the yields between them.
+            started = time.thread_time()
+            for room in rooms[start:start + self.batch]:
+                room.step(self.delta)
+            self.window_busy += time.thread_time() - started
+            await asyncio.sleep(0)
+
+    async def run(self) -> None:
+        """
+        Tick at the fixed rate until stopped.
+
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+
+        while not self.stopped:
+            lag = max(0.0, loop.time() - next_tick)
+            await self.step()
+
+            self.ticks += 1
+            self.window_ticks += 1
+            self.window_lag += lag
+            self.window_max_lag = max(self.window_max_lag, lag)
+
+            next_tick += self.tick
+            behind = int((loop.time() - next_tick) / self.tick)
+            if behind > self.max_behind:
+                self.skipped += behind
+                next_tick += behind * self.tick
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def metrics(self) -> dict:
+        """
+        Stats since the last call.
+
+        :return: (DICT) rooms, tick rate, tick lag, busy fraction (CPU time ticking the rooms over the wall time) and CPU
+        per room.
+        """
+        elapsed = time.perf_counter() - self.window_started
+        cpu = [room.cpu - self.window_cpu.get(room_id, 0.0) for room_id, room in self.rooms.items()]
+        ticks = max(self.window_ticks, 1)
+
+        metrics = {
+            "shard": self.shard_id,
+            "pid": os.getpid(),
+            "rooms": len(self.rooms),
+            "ticks": self.ticks,
+            "skipped": self.skipped,
+            "tick_rate": self.window_ticks / elapsed,
+            "lag_ms": self.window_lag / ticks * 1000,
+            "max_lag_ms": self.window_max_lag * 1000,
+            "busy": self.window_busy / elapsed,
+            "room_cpu_us": sum(cpu) / len(cpu) / ticks * 1e6 if cpu else 0.0,
+            "max_room_cpu_us": max(cpu, default=0.0) / ticks * 1e6
+        }
+        self.reset_window()
+
+        return metrics
+
+    async def serve(self, commands: object, reports: object, interval: float = 1.0) -> None:
+        """
+        Tick the rooms while reading the commands and sending the stats of the shard.
+
+        :param commands: (QUEUE) ("create", room_id), ("close", room_id) or ("stop",).
+        :param reports: (QUEUE) Receives .metrics() each interval.
+        :param interval: (FLOAT) Seconds between reports.
+        :return:
+        """
+        ticker = asyncio.create_task(self.run())
+        next_report = time.perf_counter() + interval
+
+        while not self.stopped:
+            while True:
+                try:
+                    command, *args = commands.get_nowait()
+                except queue.Empty:
+                    break
+
+                if command == "stop":
+                    self.stopped = True
+                else:
+                    getattr(self, command)(*args)
+
+            if time.perf_counter() >= next_report:
+                reports.put(self.metrics())
+                next_report += interval
+
+            await asyncio.sleep(0.05)
+
+        await ticker
+
+
+def work(shard_id: int, commands: object, reports: object, options: dict) -> None:
+    """
+    Worker process entry point.
+
+    :param shard_id: (INT) Worker index.
+    :param commands: (QUEUE) Commands of this worker.
+    :param reports: (QUEUE) Stats of every worker.
+    :param options: (DICT) Shard arguments.
+    :return:
+    """
+    asyncio.run(Shard(shard_id, **options).serve(commands, reports))
+
+
+class Cluster:
+    """
+    Worker processes and the rooms routing.
+    """
+    def __init__(self, workers: int = os.cpu_count(), **options):
+        """
+        Start the workers.
+
+        :param workers: (INT) Worker processes.
+        :param options: Shard arguments (tick_rate, game_speed, batch, continuous).
+        """
+        self.commands = [multiprocessing.Queue() for i in range(workers)]
+        self.reports = multiprocessing.Queue()
+        self.latest = {}
+        self.processes = [
+            multiprocessing.Process(target=work, args=(shard_id, commands, self.reports, options), daemon=True)
+            for shard_id, commands in enumerate(self.commands)
+        ]
+        for process in self.processes:
+            process.start()
+
+    def create(self, room_id: object) -> None:
+        """
+        Open a room on its worker.
+
+        :param room_id: (OBJECT) Room id.
+        :return:
+        """
+        self.commands[shard_of(room_id, len(self.commands))].put(("create", room_id))
+
+    def close(self, room_id: object) -> None:
+        """
+        Close a room on its worker.
+
+        :param room_id: (OBJECT) Room id.
+        :return:
+        """
+        self.commands[shard_of(room_id, len(self.commands))].put(("close", room_id))
+
+    def metrics(self) -> dict:
+        """
+        Latest stats of each worker.
+
+        :return: (DICT) Worker index: metrics.
+        """
+        while True:
+            try:
+                metrics = self.reports.get_nowait()
+            except queue.Empty:
+                break
+            self.latest[metrics["shard"]] = metrics
+
+        return self.latest
+
+    def stop(self) -> None:
+        """
+        Stop the workers.
+
+        :return:
+        """
+        for commands in self.commands:
+            commands.put(("stop",))
+        for process in self.processes:
+            process.join()
+
+
+def main() -> None:
+    """
+    Rooms server command line: open rooms of IA matches and print the stats of each worker every second.
+
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Many matches sharded across worker processes.")
+    parser.add_argument("--rooms", type=int, default=500, help="IA vs IA rooms to open")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--batch", type=int, default=64, help="rooms ticked before yielding to the event loop")
+    parser.add_argument("--tick-rate", type=float, default=TIMING["tick_rate"], help="ticks per second")
+    parser.add_argument("--substeps", action="store_true", help="use the fixed substep mode instead of the continuous one")
+    parser.add_argument("--seconds", type=float, default=None, help="time to run, until Ctrl+C if not set")
+    args = parser.parse_args()
+
+    cluster = Cluster(workers=args.workers, tick_rate=args.tick_rate, batch=args.batch, continuous=not args.substeps)
+    for room_id in range(args.rooms):
+        cluster.create(room_id)
+
+    started = time.perf_counter()
+    try:
+        while args.seconds is None or time.perf_counter() - started < args.seconds:
+            time.sleep(1)
+            shards = sorted(cluster.metrics().values(), key=lambda metrics: metrics["shard"])
+            if not shards:
+                continue
+
+            print(f"{'shard':>5}{'rooms':>7}{'ticks/s':>9}{'lag ms':>8}{'max lag':>9}{'busy':>7}{'room us':>9}{'max us':>8}{'skipped':>9}")
+            for metrics in shards:
+                print(f"{metrics['shard']:>5}{metrics['rooms']:>7}{metrics['tick_rate']:>9.1f}{metrics['lag_ms']:>8.2f}"
+                      f"{metrics['max_lag_ms']:>9.2f}{metrics['busy']:>7.0%}{metrics['room_cpu_us']:>9.1f}"
+                      f"{metrics['max_room_cpu_us']:>8.1f}{metrics['skipped']:>9}")
+            print(f"{'all':>5}{sum(metrics['rooms'] for metrics in shards):>7}"
+                  f"{min(metrics['tick_rate'] for metrics in shards):>9.1f}{max(metrics['lag_ms'] for metrics in shards):>8.2f}"
+                  f"{max(metrics['max_lag_ms'] for metrics in shards):>9.2f}\n")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cluster.stop()
+
+
+if __name__ == "__main__":
+    main()
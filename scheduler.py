@@ -0,0 +1,113 @@
+"""
+Fixed timestep game loop.
+
+The SimulationThread advances the game in ticks of the same length on its own thread, no matter how fast the machine
+draws, and publishes an immutable snapshot after each one. The screen thread only draws the latest snapshot, with the
+frames capped and paced by sleeping (pace()), so a slow redraw can't delay or stretch the simulation and the game
+doesn't keep a CPU core busy.
+"""
+import threading
+import time
+from engine import TIMING
+
+
+def pace(render: object, running: object, render_rate: float = TIMING["render_rate"]) -> None:
+    """
+    Draw frames while running, at most at the render rate, sleeping until the next frame is due.
+
+    :param render: (FUNCTION) Draws a frame, called without arguments.
+    :param running: (FUNCTION) Returns False to stop.
+    :param render_rate: (FLOAT) Max frames per second. 0 for no cap.
+    :return:
+    """
+    frame_time = 1 / render_rate if render_rate else 0
+
+    while running():
+        started = time.perf_counter()
+        render()
+
+        # Frame pacing: give the CPU back until the next frame.
+        wait = frame_time - (time.perf_counter() - started)
+        if wait > 0:
+            time.sleep(wait)
+
+
+class SimulationThread(threading.Thread):
+    """
+    Runs the simulation at a fixed tick rate and publishes the match state through a double buffer.
+    """
+    def __init__(self, match: object, update: object, tick_rate: float = TIMING["tick_rate"], game_speed: float = TIMING["game_speed"], profiler: object = None):
+        """
+        Init the thread (started with .start()).
+
+        :param match: (OBJECT) Match whose Match.snapshot() is published.
+        :param update: (FUNCTION) Called with the game time of one tick (ex.: match.step).
+        :param tick_rate: (FLOAT) Simulation ticks per second.
+        :param game_speed: (FLOAT) Game time passed per real second.
+        :param profiler: (OBJECT) Optional profiler.FrameProfiler of the match, its frames are ended on each tick.
+        """
+        super().__init__(name="simulation", daemon=True)
+        self.match = match
+        self.update = update
+        self.tick = 1 / tick_rate
+        self.delta = self.tick * game_speed
+        self.profiler = profiler
+        # Ticks late before giving up catching up (the missed time is dropped, so a long pause doesn't freeze the game catching up).
+        self.max_behind = 25
+
+        self.ticks = 0
+        self.stopped = threading.Event()
+        # Two slots of (tick, publish time, state). The reader only takes the front one, which is never written, and
+        # the writer flips the front index after filling the back one. The snapshots are immutable, so no lock.
+        self.buffers = [None, None]
+        self.front = 0
+
+    def publish(self) -> None:
+        """
+        Put the actual match state in the back slot and make it the front one.
+
+        :return:
+        """
+        back = 1 - self.front
+        self.buffers[back] = (self.ticks, time.perf_counter(), self.match.snapshot())
+        self.front = back
+
+    def latest(self) -> tuple:
+        """
+        Last published snapshot. Safe to call from any thread.
+
+        :return: (TUPLE) (tick, publish time, Match.snapshot()) or None before the first tick.
+        """
+        return self.buffers[self.front]
+
+    def run(self) -> None:
+        """
+        Tick until stopped.
+
+        :return:
+        """
+        next_tick = time.perf_counter()
+
+        while not self.stopped.is_set():
+            self.update(self.delta)
+            self.ticks += 1
+            if self.profiler is not None:
+                self.profiler.end_frame()
+            self.publish()
+
+            next_tick += self.tick
+            wait = next_tick - time.perf_counter()
+            if wait > 0:
+                self.stopped.wait(wait)
+            elif -wait > self.tick * self.max_behind:
+                next_tick = time.perf_counter()
+
+    def stop(self) -> None:
+        """
+        Stop ticking and wait for the thread to end.
+
+        :return:
+        """
+        self.stopped.set()
+        if self.is_alive():
+            self.join()
@@ -0,0 +1,136 @@
+"""
+Accelerated soak test of a long session.
+
+Plays an IA match as fast as possible with long ticks, with the frame profiler and the ball event writer on, and
+samples the process RSS and the tracemalloc current size over time. The ball uses the continuous collision mode, but
+a long tick is still a coarser game: the paddles move a whole tick of distance at once (more than their height at
+the default --delta, so they can go a bit through the top and bottom walls). It tests the memory, not the play. The memory must stay flat: the exit code is 1 if either grew more than its allowed bytes.
+With --view the turtle screen is drawn too (needs a display) and its canvas items are counted.
+
+Run: python soak.py [--days 14] [--delta 2] [--samples 20] [--view]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from engine import Match
+from profiler import FrameProfiler
+from telemetry import EventWriter
+
+
+def rss() -> int:
+    """
+    Resident memory of the process.
+
+    :return: (INT) Bytes (the peak instead of the current one where /proc is missing).
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+
+def soak(days: float, delta: float, samples: int, view: bool, directory: str) -> list:
+    """
+    Play the session and sample the memory.
+
+    :param days: (FLOAT) Game time to play, in days.
+    :param delta: (FLOAT) Game time per tick.
+    :param samples: (INT) Memory samples over the session.
+    :param view: (BOOL) Draw the turtle screen.
+    :param directory: (STR) Folder of the rotating event files.
+    :return: (LIST) Samples (DICT) of frame, game days, goals, RSS, tracemalloc and canvas items.
+    """
+    if view:
+        from classes import Game, IA, Ball
+        game = Game()
+        game.screen.tracer(0)
+        match = Match(players=[IA(1), IA(2)], ball=Ball(), continuous=True)
+    else:
+        game = None
+        match = Match(continuous=True)
+
+    profiler = FrameProfiler()
+    match.profiler = profiler
+    if game is not None:
+        game.profiler = profiler
+    writer = EventWriter(os.path.join(directory, "events.jsonl"), max_bytes=1024 * 1024, backups=2)
+    match.ball.events = writer.events
+
+    frames = round(days * 24 * 3600 / delta)
+    every = max(frames // samples, 1)
+    results = []
+    started = time.perf_counter()
+
+    for frame in range(1, frames + 1):
+        match.step(delta)
+        if game is not None:
+            game.render(players=match.players, ball=match.ball)
+        else:
+            profiler.end_frame()
+
+        if frame % every == 0:
+            # Write the queued events first, the queue holds up to a second of them and isn't kept memory.
+            writer.flush()
+            results.append({
+                "frame": frame,
+                "days": frame * delta / 24 / 3600,
+                "goals": sum(player.score.current_score for player in match.players),
+                "rss": rss(),
+                "traced": tracemalloc.get_traced_memory()[0],
+                "items": len(game.screen.getcanvas().find_all()) if game is not None else 0,
+                "seconds": time.perf_counter() - started
+            })
+            sample = results[-1]
+            print(f"{sample['days']:>7.2f}{sample['goals']:>9}{sample['rss'] / 2 ** 20:>10.1f}{sample['traced'] / 2 ** 10:>12.1f}"
+                  f"{sample['items']:>7}{sample['seconds']:>9.1f}", flush=True)
+
+    writer.close()
+    if writer.events.dropped:
+        print(f"{writer.events.dropped} events dropped, the writer fell behind")
+
+    return results
+
+
+def main() -> int:
+    """
+    Soak test command line.
+
+    :return: (INT) Exit code, 1 if the traced memory, the RSS or the canvas items grew.
+    """
+    parser = argparse.ArgumentParser(description="Accelerated long session memory test.")
+    parser.add_argument("--days", type=float, default=14, help="game time to play, in days")
+    parser.add_argument("--delta", type=float, default=2, help="game seconds per tick")
+    parser.add_argument("--samples", type=int, default=20, help="memory samples (at least 2, the halves are compared)")
+    parser.add_argument("--max-growth", type=int, default=256 * 1024, help="bytes the traced memory may grow from the first to the second half")
+    parser.add_argument("--max-rss-growth", type=int, default=8 * 1024 * 1024, help="bytes the RSS may grow from the first to the second half")
+    parser.add_argument("--view", action="store_true", help="draw the turtle screen too")
+    args = parser.parse_args()
+    if args.samples < 2:
+        parser.error("--samples must be at least 2")
+
+    tracemalloc.start()
+    print(f"{'days':>7}{'goals':>9}{'rss MB':>10}{'traced KB':>12}{'items':>7}{'seconds':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        results = soak(days=args.days, delta=args.delta, samples=args.samples, view=args.view, directory=directory)
+
+    # The lowest sample of each half. The event queue is written before each sample, but the first half includes the
+    # warm up (profiler ring buffer and file buffers getting to their size), and the RSS goes up and down a few MB
+    # with the allocator (the event batches written), so its limit is higher.
+    if len(results) < 2:
+        print("not enough samples to compare (less frames than samples)")
+        return 1
+    half = len(results) // 2
+    growth = min(sample["traced"] for sample in results[half:]) - min(sample["traced"] for sample in results[:half])
+    rss_growth = min(sample["rss"] for sample in results[half:]) - min(sample["rss"] for sample in results[:half])
+    items = results[-1]["items"] - results[0]["items"]
+    print(f"traced memory growth: {growth / 1024:+.1f} KB, RSS growth: {rss_growth / 2 ** 20:+.1f} MB, canvas items: {items:+}")
+
+    return 1 if growth > args.max_growth or rss_growth > args.max_rss_growth or items > 0 else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
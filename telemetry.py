@@ -0,0 +1,280 @@
+"""
+Ball event stream: paddle hits, wall bounces, goals and relocations.
+
+The ball appends each event as a tuple to the EventWriter deque (see engine.Ball.emit()), and a background thread
+takes them in batches and writes them to JSON lines or CSV files, rotated by size. The summary reads any number of
+event files line by line, so it keeps the same small memory for millions of events.
+
+Run: PONG_EVENTS=events.jsonl python main.py
+     python telemetry.py summary events.jsonl events.jsonl.1
+     python telemetry.py generate events.jsonl [--frames 100000] (headless IA match)
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from engine import TIMING, Vector, Match
+
+FIELDS = ("event", "time", "x", "y", "vector_x", "vector_y", "speed", "value")
+# Bin width of the bounce angles histogram, in degrees.
+ANGLE_BIN = 10
+
+
+class EventQueue(deque):
+    """
+    Bounded queue of events that counts the oldest ones dropped when it is full (the writer fell behind).
+    """
+    def __init__(self, maxlen: int):
+        """
+        Init the queue.
+
+        :param maxlen: (INT) Max events queued.
+        """
+        super().__init__(maxlen=maxlen)
+        self.dropped = 0
+
+    def append(self, event: tuple) -> None:
+        """
+        Queue an event, dropping the oldest one if full.
+
+        :param event: (TUPLE) Event, see engine.Ball.emit().
+        :return:
+        """
+        if len(self) == self.maxlen:
+            self.dropped += 1
+        super().append(event)
+
+
+class EventWriter:
+    """
+    Background writer of the ball events into rotating files.
+    """
+    def __init__(self, path: str, max_bytes: int = 64 * 1024 * 1024, backups: int = 5, interval: float = 0.5, max_events: int = 100000):
+        """
+        Open the file and start the writer thread.
+
+        :param path: (STR) File path. CSV if it ends with ".csv", JSON lines otherwise.
+        :param max_bytes: (INT) Size that makes the file rotate (path -> path.1 -> path.2 ...).
+        :param backups: (INT) Rotated files kept.
+        :param interval: (FLOAT) Seconds between writes.
+        :param max_events: (INT) Events queued between writes, the oldest are dropped (and counted) past it.
+        """
+        self.path = path
+        self.csv = path.endswith(".csv")
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.interval = interval
+        self.events = EventQueue(max_events) # Set as Ball.events.
+        self.written = 0
+        # Held while writing, so .flush() can also be called from another thread than the writer one.
+        self.lock = threading.Lock()
+
+        self.file = None
+        self.writer = None
+        self.open()
+
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="events", daemon=True)
+        self.thread.start()
+
+    def open(self) -> None:
+        """
+        Open the file, with the CSV header if it is a new one.
+
+        :return:
+        """
+        new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self.file = open(self.path, "a", newline="")
+
+        if self.csv:
+            self.writer = csv.writer(self.file)
+            if new:
+                self.writer.writerow(FIELDS)
+
+    def rotate(self) -> None:
+        """
+        Move the file to path.1 (and the older ones one number up) and start a new one.
+
+        :return:
+        """
+        self.file.close()
+
+        for number in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{number}"):
+                os.replace(f"{self.path}.{number}", f"{self.path}.{number + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+        self.open()
+
+    def flush(self) -> None:
+        """
+        Write the queued events. Safe to call from any thread, ex.: to empty the queue before measuring the memory.
+
+        :return:
+        """
+        with self.lock:
+            events = self.events
+            batch = [events.popleft() for i in range(len(events))]
+            if not batch:
+                return
+
+            if self.csv:
+                self.writer.writerows(batch)
+            else:
+                self.file.write("".join(json.dumps(dict(zip(FIELDS, event))) + "\n" for event in batch))
+            self.file.flush()
+            self.written += len(batch)
+
+            if self.file.tell() >= self.max_bytes:
+                self.rotate()
+
+    def run(self) -> None:
+        """
+        Writer thread.
+
+        :return:
+        """
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def close(self) -> None:
+        """
+        Stop the thread, write the last events and close the file.
+
+        :return:
+        """
+        if self.stopped.is_set():
+            return
+
+        self.stopped.set()
+        self.thread.join()
+        self.flush()
+        self.file.close()
+
+
+def read(path: str) -> object:
+    """
+    Read an event file one event at a time.
+
+    :param path: (STR) JSON lines or CSV file.
+    :return: (GENERATOR) (event, time, x, y, vector_x, vector_y, speed, value)
+    """
+    with open(path, newline="") as file:
+        # Rotated files keep the extension before their number (events.csv.1).
+        if ".csv" in os.path.basename(path):
+            rows = csv.reader(file)
+            next(rows, None)
+            for row in rows:
+                yield (row[0], *(float(value) for value in row[1:]))
+        else:
+            for line in file:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue # Half written last line.
+                yield tuple(event[field] for field in FIELDS)
+
+
+def summary(paths: list) -> dict:
+    """
+    Stats of the events of some files, read as a stream (give them oldest first: path.2, path.1, path).
+
+    :param paths: (LIST) Event files.
+    :return: (DICT) Counts, goals, rallies, peak speed and bounce angles histogram.
+    """
+    counts = {}
+    goals = {1: 0, 2: 0}
+    rallies = {} # Length: count.
+    angles = {} # Bin start: count.
+    hits = 0
+    peak_speed = 0.0
+    first = last = None
+
+    for path in paths:
+        for event, timestamp, x, y, vector_x, vector_y, speed, value in read(path):
+            counts[event] = counts.get(event, 0) + 1
+            first = timestamp if first is None else first
+            last = timestamp
+
+            if event == "hit":
+                hits += 1
+                peak_speed = max(peak_speed, speed)
+                # Same angle drawn by classes.Ball.draw_angle().
+                angle = Vector(vector_x, vector_y).getRelativeAngle()
+                bin_start = math.floor(angle / ANGLE_BIN) * ANGLE_BIN
+                angles[bin_start] = angles.get(bin_start, 0) + 1
+            elif event == "goal":
+                goals[int(value)] += 1
+            elif event == "relocate" and hits:
+                rallies[hits] = rallies.get(hits, 0) + 1
+                hits = 0
+
+    total = sum(rallies.values())
+
+    return {
+        "events": counts,
+        "seconds": (last - first) if first is not None else 0,
+        "goals": goals,
+        "rallies": total,
+        "mean_rally": sum(length * count for length, count in rallies.items()) / total if total else 0,
+        "max_rally": max(rallies, default=0),
+        "peak_speed": peak_speed,
+        "angles": {f"{start}..{start + ANGLE_BIN}": angles[start] for start in sorted(angles)}
+    }
+
+
+def generate(path: str, frames: int, continuous: bool = True) -> int:
+    """
+    Write the events of a headless IA match.
+
+    :param path: (STR) Event file.
+    :param frames: (INT) Frames to play.
+    :param continuous: (BOOL) Match continuous collision mode.
+    :return: (INT) Events written.
+    """
+    match = Match(continuous=continuous)
+    writer = EventWriter(path)
+    match.ball.events = writer.events
+    delta = TIMING["game_speed"] / TIMING["tick_rate"]
+
+    for frame in range(frames):
+        match.step(delta)
+    writer.close()
+    if writer.events.dropped:
+        print(f"{writer.events.dropped} events dropped, the writer fell behind")
+
+    return writer.written
+
+
+def main() -> None:
+    """
+    Telemetry command line.
+
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Ball event files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary_parser = commands.add_parser("summary", help="stats of event files, oldest first")
+    summary_parser.add_argument("paths", nargs="+")
+    generate_parser = commands.add_parser("generate", help="write the events of a headless IA match")
+    generate_parser.add_argument("path")
+    generate_parser.add_argument("--frames", type=int, default=100000)
+    args = parser.parse_args()
+
+    if args.command == "summary":
+        started = time.perf_counter()
+        print(json.dumps(summary(args.paths), indent=4))
+        print(f"read in {time.perf_counter() - started:.2f}s")
+    else:
+        print(f"{generate(args.path, args.frames)} events written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+"""
+Terminal renderer: play the game in a text terminal (ex.: over SSH, without an X server).
+
+The arena (MAP_DIMENSIONS, origin on the center as in the game) is scaled into a character grid that fits the
+terminal. A shadow copy of the grid on the screen is kept, and each frame only writes the cells that changed with ANSI
+cursor moves (runs of changes close to each other in one write), so a frame where only the ball and a paddle moved
+costs a few dozen bytes instead of the whole screen. Plain ANSI/VT100 escapes, no curses, so it works on any terminal
+link. Key input needs a Unix terminal (termios).
+
+Keys: w/s player 1, up/down arrows player 2, q to quit. Terminals only send key presses (repeated while held), so a
+key holds its direction for KEY_DELAY seconds after its first press (until the repeats start) and KEY_HOLD after
+each repeat, and a press of the other direction ends it.
+
+Run: python terminal.py [--human 1] [--fps 30]
+     python terminal.py --bench [--frames 2000] (headless IA match, bytes against a full redraw)
+"""
+import argparse
+import io
+import os
+import select
+import shutil
+import sys
+import time
+import engine
+from engine import MAP_DIMENSIONS, TIMING, Match
+from controls import KEYS, Keyboard
+from scheduler import SimulationThread, pace
+
+CELLS = {
+    "paddle": "█",
+    "ball": "●",
+    "divider": "│",
+    "empty": " "
+}
+ASCII_CELLS = {
+    "paddle": "#",
+    "ball": "O",
+    "divider": "|",
+    "empty": " "
+}
+# Unchanged cells between two changes of a row that are written anyway instead of moving the cursor over them
+# (a cursor move is 6 to 8 bytes).
+MAX_GAP = 6
+# Seconds a key holds its direction after its first press: over the OS delay before the key repeat starts (about 250
+# to 600 ms), so a held key doesn't stop until its repeats arrive.
+KEY_DELAY = 0.65
+# Seconds a key holds its direction after a repeated press: about one OS key repeat interval (30 to 50 ms) with some
+# margin, so the paddle stops soon after the key is released.
+KEY_HOLD = 0.1
+# Terminal input sequences of the controls.KEYS names.
+SEQUENCES = {
+    "w": "w",
+    "s": "s",
+    "\x1b[A": "Up",
+    "\x1b[B": "Down",
+    "\x1bOA": "Up",
+    "\x1bOB": "Down"
+}
+# Key of the other direction of the same player.
+OPPOSITES = {keys[direction]: keys["down" if direction == "up" else "up"] for keys in KEYS.values() for direction in keys}
+
+
+class Screen:
+    """
+    Character grid of the arena with a shadow copy of what is on the terminal.
+    """
+    def __init__(self, columns: int, rows: int, output: object, ascii: bool = False):
+        """
+        Init the grids and draw the background.
+
+        :param columns: (INT) Terminal columns.
+        :param rows: (INT) Terminal rows, the last one is the status line.
+        :param output: (OBJECT) Text stream the escapes are written to (ex.: sys.stdout).
+        :param ascii: (BOOL) Only ASCII characters.
+        """
+        self.columns = columns
+        self.rows = rows - 1
+        self.output = output
+        self.cells = ASCII_CELLS if ascii else CELLS
+        # Game pixels per cell.
+        self.cell_width = MAP_DIMENSIONS["width"] / self.columns
+        self.cell_height = MAP_DIMENSIONS["height"] / self.rows
+
+        self.background = [[self.cells["empty"]] * self.columns for row in range(self.rows)]
+        self.frame = [list(row) for row in self.background]
+        # What the terminal shows, None until the first frame (so all of it is written).
+        self.shadow = None
+        self.status = ""
+
+        self.frames = 0
+        self.written = 0 # Bytes.
+
+        self.__draw_map_divider()
+
+    def __draw_map_divider(self) -> None:
+        """
+        Draw a dashed divider on the center column of the background.
+
+        :return:
+        """
+        column = self.columns // 2
+        for row in range(0, self.rows, 2):
+            self.background[row][column] = self.cells["divider"]
+
+    def fill(self, left: float, bottom: float, right: float, top: float, char: str) -> None:
+        """
+        Fill the cells of a rectangle given in game cords (origin on the center, Y up), at least one cell.
+
+        :param left: (FLOAT) Left X cord.
+        :param bottom: (FLOAT) Bottom Y cord.
+        :param right: (FLOAT) Right X cord.
+        :param top: (FLOAT) Top Y cord.
+        :param char: (STR) Cell character.
+        :return:
+        """
+        column_start = round((left + MAP_DIMENSIONS["width"] / 2) / self.cell_width)
+        column_end = max(round((right + MAP_DIMENSIONS["width"] / 2) / self.cell_width), column_start + 1)
+        row_start = round((MAP_DIMENSIONS["height"] / 2 - top) / self.cell_height)
+        row_end = max(round((MAP_DIMENSIONS["height"] / 2 - bottom) / self.cell_height), row_start + 1)
+
+        column_start = max(column_start, 0)
+        column_end = min(column_end, self.columns)
+        for row in self.frame[max(row_start, 0):min(row_end, self.rows)]:
+            row[column_start:column_end] = char * (column_end - column_start)
+
+    def text(self, text: str, x: float, row: int) -> None:
+        """
+        Write text centered on a X cord.
+
+        :param text: (STR) Text.
+        :param x: (FLOAT) Center X cord.
+        :param row: (INT) Grid row.
+        :return:
+        """
+        column = round((x + MAP_DIMENSIONS["width"] / 2) / self.cell_width - len(text) / 2)
+        column = min(max(column, 0), self.columns - len(text))
+        self.frame[row][column:column + len(text)] = text
+
+    def render(self, players: list, ball: object, alpha: float = 1) -> int:
+        """
+        Draw a frame and write the changed cells. Same arguments as classes.Game.render().
+
+        :param players: (LIST) all players instances.
+        :param ball: (OBJECT) Ball instance.
+        :param alpha: (FLOAT) Interpolation factor between the last two ticks.
+        :return: (INT) Bytes written (UTF-8).
+        """
+        frame = self.frame
+        for row, background in zip(frame, self.background):
+            row[:] = background
+
+        for player in players:
+            x = player.last_pos.x + (player.pos.x - player.last_pos.x) * alpha
+            y = player.last_pos.y + (player.pos.y - player.last_pos.y) * alpha
+            self.fill(x - player.width / 2, y - player.height / 2, x + player.width / 2, y + player.height / 2, self.cells["paddle"])
+            self.text(str(player.score.current_score), -40 if player.num_player == 1 else 40, 1)
+
+        x = ball.last_pos.x + (ball.pos.x - ball.last_pos.x) * alpha
+        y = ball.last_pos.y + (ball.pos.y - ball.last_pos.y) * alpha
+        half = ball.diameter / 2
+        self.fill(x - half, y - half, x + half, y + half, self.cells["ball"])
+
+        return self.flush()
+
+    def flush(self) -> int:
+        """
+        Write the cells of the frame that differ from the shadow grid, and update it.
+
+        :return: (INT) Bytes written (UTF-8).
+        """
+        out = []
+        shadow = self.shadow
+        if shadow is None:
+            # Clear and write it all.
+            out.append("\x1b[H\x1b[2J")
+            shadow = self.shadow = [[None] * self.columns for row in range(self.rows)]
+
+        for index, (row, shown) in enumerate(zip(self.frame, shadow)):
+            if row == shown:
+                continue
+
+            column = 0
+            while column < self.columns:
+                if row[column] == shown[column]:
+                    column += 1
+                    continue
+
+                # Run of changes, going on over gaps of unchanged cells up to MAX_GAP.
+                start = end = column
+                while column < self.columns and column - end <= MAX_GAP:
+                    if row[column] != shown[column]:
+                        end = column
+                    column += 1
+                out.append(f"\x1b[{index + 1};{start + 1}H")
+                out.append("".join(row[start:end + 1]))
+                shown[start:end + 1] = row[start:end + 1]
+
+        data = "".join(out)
+        if data:
+            self.output.write(data)
+            self.output.flush()
+
+        size = len(data.encode())
+        self.frames += 1
+        self.written += size
+
+        return size
+
+    def full_size(self) -> int:
+        """
+        Bytes of a whole screen redraw of empty cells (a lower bound), to compare with the diff writes.
+
+        :return: (INT) Bytes.
+        """
+        return len("\x1b[H") + self.rows * (self.columns + 2)
+
+    def show_status(self, text: str) -> None:
+        """
+        Write the status line (below the arena) if it changed.
+
+        :param text: (STR) Status text.
+        :return:
+        """
+        text = text[:self.columns]
+        if text == self.status:
+            return
+
+        # Padded to blank the rest of a longer last status.
+        data = f"\x1b[{self.rows + 1};1H{text.ljust(len(self.status))}"
+        self.status = text
+        self.output.write(data)
+        self.output.flush()
+        self.written += len(data.encode())
+
+    def reset(self) -> None:
+        """
+        Forget what the terminal shows, so the next frame writes all of it (ex.: after a resize).
+
+        :return:
+        """
+        self.shadow = None
+        self.status = ""
+
+
+class TerminalKeyboard(Keyboard):
+    """
+    Key presses read from the terminal input instead of a turtle screen.
+    """
+    def __init__(self, stream: object, delay: float = KEY_DELAY, hold: float = KEY_HOLD):
+        """
+        Init the keyboard.
+
+        :param stream: (OBJECT) Terminal input (ex.: sys.stdin), in cbreak mode.
+        :param delay: (FLOAT) Seconds a key is held after its first press.
+        :param hold: (FLOAT) Seconds a key is held after a repeated press.
+        """
+        super().__init__(screen=None)
+        self.stream = stream
+        self.delay = delay
+        self.hold = hold
+        self.last_press = {} # key: time.
+        self.repeating = set() # Keys pressed again before their first press hold ended.
+        self.quit = False
+
+    def bind(self, players: list) -> None:
+        """
+        Nothing to bind, the input is read by .read().
+
+        :param players: (LIST) all players instances.
+        :return:
+        """
+
+    def read(self) -> None:
+        """
+        Queue the keys typed since the last call, without waiting. Called from the render loop.
+
+        :return:
+        """
+        fd = self.stream.fileno()
+        data = ""
+        while select.select([fd], [], [], 0)[0]:
+            chunk = os.read(fd, 1024)
+            if not chunk:
+                break
+            data += chunk.decode(errors="ignore")
+
+        now = time.perf_counter()
+        index = 0
+        while index < len(data):
+            if data[index] == "q":
+                self.quit = True
+            for sequence, key in SEQUENCES.items():
+                if data.startswith(sequence, index):
+                    self.events.append((now, key, True))
+                    index += len(sequence)
+                    break
+            else:
+                index += 1
+
+    def poll(self) -> set:
+        """
+        Process the queued presses.
+
+        :return: (SET) Keys still held: pressed in the last .delay seconds, or .hold seconds once repeating.
+        """
+        last_press = self.last_press
+        repeating = self.repeating
+
+        while self.events:
+            timestamp, key, pressed = self.events.popleft()
+            if timestamp - last_press.get(key, -self.delay) < self.delay:
+                repeating.add(key)
+            else:
+                repeating.discard(key)
+            last_press[key] = timestamp
+
+            # A press of the other direction is a release of this one (there are no release events).
+            last_press.pop(OPPOSITES[key], None)
+            repeating.discard(OPPOSITES[key])
+
+        now = time.perf_counter()
+
+        return {key for key, timestamp in last_press.items() if now - timestamp < (self.hold if key in repeating else self.delay)}
+
+
+def play(humans: list, fps: float, ascii: bool, key_delay: float = KEY_DELAY) -> None:
+    """
+    Play on the terminal until q is pressed. The simulation runs on its own thread as in main.py.
+
+    :param humans: (LIST) Numbers of the human players, the others are IA.
+    :param fps: (FLOAT) Frames drawn per second.
+    :param ascii: (BOOL) Only ASCII characters.
+    :param key_delay: (FLOAT) Seconds a key is held after its first press, see KEY_DELAY.
+    :return:
+    """
+    import termios
+    import tty
+
+    players = [(engine.Player if num_player in humans else engine.IA)(num_player) for num_player in (1, 2)]
+    match = Match(players=players, continuous=True)
+    view = Match(players=[(engine.IA if player.is_ia else engine.Player)(player.num_player) for player in players])
+    keyboard = TerminalKeyboard(sys.stdin, delay=key_delay)
+
+    def update(delta: float) -> None:
+        """
+        Advance the game one fixed tick (on the simulation thread).
+
+        :param delta: (FLOAT) Game time of the tick.
+        :return:
+        """
+        keyboard.apply(players)
+        match.step(delta)
+
+    simulation = SimulationThread(match=match, update=update)
+    size = shutil.get_terminal_size()
+    # Screen (made again on a resize) and the counters of the last status update.
+    shown = {"size": size, "screen": Screen(size.columns, size.lines, sys.stdout, ascii=ascii), "second": time.perf_counter(), "written": 0, "frames": 0}
+
+    def render() -> None:
+        """
+        Read the keys and draw the latest snapshot, between its tick and the one before.
+
+        :return:
+        """
+        now = time.perf_counter()
+        keyboard.read()
+
+        if shutil.get_terminal_size() != shown["size"]:
+            size = shown["size"] = shutil.get_terminal_size()
+            shown["screen"] = Screen(size.columns, size.lines, sys.stdout, ascii=ascii)
+            shown["written"] = shown["frames"] = 0
+        screen = shown["screen"]
+
+        snapshot = simulation.latest()
+        if snapshot is not None:
+            tick, published, state = snapshot
+            view.restore(state)
+            screen.render(view.players, view.ball, alpha=min((now - published) / simulation.tick, 1))
+
+        # Status once per second, so it doesn't cost a write on every frame.
+        elapsed = now - shown["second"]
+        if elapsed >= 1:
+            rate = (screen.written - shown["written"]) / elapsed
+            screen.show_status(f"{(screen.frames - shown['frames']) / elapsed:.0f} fps {rate / 1024:.1f} KB/s"
+                               f" (full redraw {screen.full_size() * fps / 1024:.0f} KB/s)  q: quit")
+            shown["second"], shown["written"], shown["frames"] = now, screen.written, screen.frames
+
+    settings = termios.tcgetattr(sys.stdin)
+    tty.setcbreak(sys.stdin)
+    # Alternate screen and hidden cursor.
+    sys.stdout.write("\x1b[?1049h\x1b[?25l")
+    try:
+        simulation.start()
+        pace(render, running=lambda: not keyboard.quit, render_rate=fps)
+    finally:
+        simulation.stop()
+        sys.stdout.write("\x1b[?25h\x1b[?1049l")
+        sys.stdout.flush()
+        termios.tcsetattr(sys.stdin, termios.TCSADRAIN, settings)
+
+
+def bench(frames: int, columns: int, rows: int) -> None:
+    """
+    Draw a headless IA match into a string buffer and compare the bytes with full redraws.
+
+    :param frames: (INT) Frames to draw.
+    :param columns: (INT) Terminal columns.
+    :param rows: (INT) Terminal rows.
+    :return:
+    """
+    match = Match(continuous=True)
+    output = io.StringIO()
+    screen = Screen(columns, rows, output)
+    # A frame per render_rate frame time of game.
+    delta = TIMING["game_speed"] / TIMING["render_rate"]
+
+    screen.render(match.players, match.ball)
+    first = screen.written
+    started = time.perf_counter()
+    for frame in range(frames):
+        match.step(delta)
+        screen.render(match.players, match.ball)
+        output.seek(0)
+        output.truncate()
+    elapsed = time.perf_counter() - started
+
+    average = (screen.written - first) / frames
+    print(f"{columns}x{rows}: {frames / elapsed:.0f} frames/s, {average:.0f} bytes/frame against {screen.full_size()} "
+          f"for a full redraw ({average / screen.full_size():.1%}), {average * TIMING['render_rate'] / 1024:.1f} KB/s at {TIMING['render_rate']} fps")
+
+
+def main() -> None:
+    """
+    Terminal renderer command line.
+
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Play on a text terminal.")
+    parser.add_argument("--human", type=int, action="append", default=[], choices=(1, 2), help="human player number (repeat for both)")
+    parser.add_argument("--fps", type=float, default=30, help="frames drawn per second")
+    parser.add_argument("--ascii", action="store_true", help="only ASCII characters")
+    parser.add_argument("--key-delay", type=float, default=KEY_DELAY, help="seconds a key is held after its first press (over the OS key repeat delay)")
+    parser.add_argument("--bench", action="store_true", help="headless IA match, bytes written against full redraws")
+    parser.add_argument("--frames", type=int, default=2000, help="frames drawn by --bench")
+    parser.add_argument("--size", default="80x24", help="terminal size of --bench, COLUMNSxROWS")
+    args = parser.parse_args()
+
+    if args.bench:
+        columns, rows = (int(value) for value in args.size.split("x"))
+        bench(args.frames, columns, rows)
+    else:
+        play(humans=args.human, fps=args.fps, ascii=args.ascii, key_delay=args.key_delay)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+IA tournament runner for difficulty calibration.
+
+Plays headless matches of a challenger IA (player 2) against the reference IA (player 1) over a grid of challenger
+speeds, ball speed increments and max angles, on a process pool using every core. Each finished match is appended
+to a JSON lines results file as soon as it ends, so a run can be stopped and resumed, and the table is built from it.
+
+Run: python tournament.py --speeds 0.03,0.31,0.32,0.4 --increments 5,10 --angles 30,40 --matches 20
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from engine import MAP_DIMENSIONS, PLAYER_SPEED, TIMING, Ball, IA, Match
+
+# Run settings shared by every match of a run (the grid is speed, increment and angle).
+SETTINGS = ("reference", "goals", "max_ticks", "continuous")
+
+
+class RallyBall(Ball):
+    """
+    Ball that keeps the rally stats of a match.
+    """
+    def __init__(self):
+        """
+        Init the ball and its stats.
+        """
+        self.hits = 0
+        self.rallies = [] # Paddle hits of each finished rally.
+        self.peak_speed = 0
+        super().__init__()
+
+    def bounce(self, angle: float) -> None:
+        """
+        Count the paddle hit and the top speed.
+
+        :param angle: (FLOAT) Current angle between ball and paddle.
+        :return:
+        """
+        super().bounce(angle)
+        self.hits += 1
+        self.peak_speed = max(self.peak_speed, self.speed)
+
+    def relocate(self, direction: int) -> None:
+        """
+        Close the rally on each goal.
+
+        :param direction: (INT) -1 to start moving on left side or 1 to the right side.
+        :return:
+        """
+        if self.hits:
+            self.rallies.append(self.hits)
+        self.hits = 0
+        super().relocate(direction)
+
+
+def play(config: dict) -> dict:
+    """
+    Play a match until a player gets the goals target or the ticks run out.
+
+    :param config: (DICT) speed, increment, angle, seed, reference, goals, max_ticks and continuous.
+    :return: (DICT) The config plus the match results.
+    """
+    ball = RallyBall()
+    ball.speed_increment = config["increment"]
+    ball.max_angle = config["angle"]
+    ball.serve_random = random.Random(config["seed"])
+    ball.relocate(-1)
+
+    players = [IA(1), IA(2)]
+    players[0].speed = MAP_DIMENSIONS["width"] * config["reference"]
+    players[1].speed = MAP_DIMENSIONS["width"] * config["speed"]
+
+    match = Match(players=players, ball=ball, continuous=config["continuous"])
+    delta = TIMING["game_speed"] / TIMING["tick_rate"]
+
+    ticks = 0
+    while ticks < config["max_ticks"] and max(player.score.current_score for player in players) < config["goals"]:
+        match.step(delta)
+        ticks += 1
+
+    scores = [player.score.current_score for player in players]
+
+    return dict(config, **{
+        "scores": scores,
+        "winner": 0 if scores[0] == scores[1] else (1 if scores[0] > scores[1] else 2),
+        "ticks": ticks,
+        "rallies": ball.rallies,
+        "peak_speed": ball.peak_speed
+    })
+
+
+def key(config: dict) -> tuple:
+    """
+    Identify a match: its place on the grid, its seed and the run settings, so a run with other settings never
+    takes the matches of an older one as done.
+
+    :param config: (DICT) Match config (or result).
+    :return: (TUPLE) Key.
+    """
+    return (config["speed"], config["increment"], config["angle"], config["seed"], *(config[name] for name in SETTINGS))
+
+
+def load(path: str) -> list:
+    """
+    Read the results already saved (a half written last line from a killed run is skipped).
+
+    :param path: (STR) Results file.
+    :return: (LIST) Results.
+    """
+    results = []
+    if not os.path.exists(path):
+        return results
+
+    with open(path) as file:
+        for line in file:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+
+    return results
+
+
+def report(results: list) -> None:
+    """
+    Print the win rate, rally length and speed table of each challenger config, one table per run settings.
+
+    :param results: (LIST) Match results.
+    :return:
+    """
+    runs = {} # Settings: {grid config: results}.
+    for result in results:
+        groups = runs.setdefault(tuple(result[name] for name in SETTINGS), {})
+        groups.setdefault((result["speed"], result["increment"], result["angle"]), []).append(result)
+
+    for settings, groups in sorted(runs.items()):
+        print(", ".join(f"{name} {value}" for name, value in zip(SETTINGS, settings)))
+        table(groups)
+
+
+def table(groups: dict) -> None:
+    """
+    Print the table of the challenger configs of a run.
+
+    :param groups: (DICT) (speed, increment, angle): results.
+    :return:
+    """
+    print(f"{'speed':>7}{'incr':>6}{'angle':>6}{'matches':>9}{'win %':>8}{'draw %':>8}{'rally':>8}{'max rally':>10}{'peak speed':>11}")
+    for (speed, increment, angle), group in sorted(groups.items()):
+        rallies = [rally for result in group for rally in result["rallies"]]
+        wins = sum(result["winner"] == 2 for result in group) / len(group)
+        draws = sum(result["winner"] == 0 for result in group) / len(group)
+
+        print(f"{speed:>7}{increment:>6}{angle:>6}{len(group):>9}{wins:>8.0%}{draws:>8.0%}"
+              f"{statistics.fmean(rallies) if rallies else 0:>8.1f}{max(rallies, default=0):>10}"
+              f"{statistics.fmean(result['peak_speed'] for result in group):>11.0f}")
+
+
+def floats(text: str) -> list:
+    """
+    Parse a comma separated list of numbers.
+
+    :param text: (STR) Ex.: "0.03,0.31"
+    :return: (LIST) Numbers.
+    """
+    return [float(value) for value in text.split(",")]
+
+
+def main() -> None:
+    """
+    Tournament command line.
+
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="IA vs IA tournament over a grid of difficulty settings.")
+    parser.add_argument("--speeds", type=floats, default=[0.03, 0.04, 0.31, 0.32, 0.4], help="challenger speeds, as a factor of the map width")
+    parser.add_argument("--increments", type=floats, default=[Ball().speed_increment], help="ball speed increments")
+    parser.add_argument("--angles", type=floats, default=[Ball().max_angle], help="ball max angles")
+    parser.add_argument("--reference", type=float, default=PLAYER_SPEED["ia"] / MAP_DIMENSIONS["width"], help="reference IA speed, as a factor of the map width")
+    parser.add_argument("--matches", type=int, default=10, help="matches (serve seeds) per config")
+    parser.add_argument("--goals", type=int, default=5, help="goals to win a match")
+    parser.add_argument("--max-ticks", type=int, default=100000, help="ticks before a match is a draw")
+    parser.add_argument("--continuous", action="store_true", help="use the continuous collision mode")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--results", default="tournament.jsonl", help="results file, resumed if it exists")
+    parser.add_argument("--report", action="store_true", help="only print the table of the results file")
+    args = parser.parse_args()
+
+    results = load(args.results)
+    if args.report:
+        report(results)
+        return
+
+    done = {key(result) for result in results}
+    configs = [
+        {"speed": speed, "increment": increment, "angle": angle, "seed": seed, "reference": args.reference,
+         "goals": args.goals, "max_ticks": args.max_ticks, "continuous": args.continuous}
+        for speed, increment, angle, seed in itertools.product(args.speeds, args.increments, args.angles, range(args.matches))
+    ]
+    pending = [config for config in configs if key(config) not in done]
+    print(f"{len(configs) - len(pending)} matches already done, {len(pending)} to play on {args.workers} workers")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool, open(args.results, "a") as file:
+        futures = [pool.submit(play, config) for config in pending]
+        for count, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results.append(result)
+            file.write(json.dumps(result) + "\n")
+            file.flush()
+
+            print(f"[{count}/{len(pending)}] speed {result['speed']} incr {result['increment']} angle {result['angle']} "
+                  f"seed {result['seed']}: {result['scores'][0]}-{result['scores'][1]}")
+
+    report(results)
+
+
+if __name__ == "__main__":
+    main()